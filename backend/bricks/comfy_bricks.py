@@ -1,9 +1,12 @@
 import random
 import sys
+import threading
 from pathlib import Path
 
 import torch
 
+from logger import get_logger
+
 # Add ComfyUI to Python path so internal imports work
 comfyui_path = Path(__file__).parent.parent / "ComfyUI"
 if str(comfyui_path) not in sys.path:
@@ -16,8 +19,26 @@ from comfy.sample import sample  # type: ignore
 from comfy.sd import load_checkpoint_guess_config  # type: ignore
 from comfy.sd import load_lora_for_models  # type: ignore
 from comfy.utils import load_torch_file  # type: ignore
+import comfy.model_management  # type: ignore
 import comfy.model_sampling  # type: ignore
 
+log = get_logger("comfy_bricks")
+
+# ComfyUI keeps its loaded-model list in a module global without locking. Samplers running
+# on different threads (variant pipelining, LOW prefetch) must not load/unload concurrently,
+# so every load_models_gpu call (including the one inside sample()) goes through this lock.
+model_loading_lock = threading.RLock()
+
+if not getattr(comfy.model_management.load_models_gpu, "_kino_locked", False):
+    _load_models_gpu = comfy.model_management.load_models_gpu
+
+    def _load_models_gpu_locked(*args, **kwargs):
+        with model_loading_lock:
+            return _load_models_gpu(*args, **kwargs)
+
+    _load_models_gpu_locked._kino_locked = True
+    comfy.model_management.load_models_gpu = _load_models_gpu_locked
+
 
 def load_checkpoint_plugin(ckpt_path):
     out = load_checkpoint_guess_config(ckpt_path, output_vae=True, output_clip=True, output_clipvision=True)
@@ -134,6 +155,106 @@ def model_sampling_sd3(model, shift=8):
         return model
 
 
+def is_fully_loaded(model) -> bool:
+    """
+    Check that all weights of a ModelPatcher are resident on its load device
+
+    Such a model is not offloaded (lowvram) and load_models_gpu has nothing left to move.
+    Clones share the underlying model, so this also works for patched copies.
+    """
+    return model.loaded_size() >= model.model_size()
+
+
+def cuda_graph_model(model):
+    """
+    Run model forward through CUDA Graph capture/replay
+
+    Each input signature (shapes/dtypes of latent, timestep and conditioning tensors) is
+    run eagerly once as warmup, captured into a CUDA Graph on the next call and then
+    replayed: inputs are copied into static buffers and the whole forward is a single
+    graph launch. Falls back to eager execution if capture fails (e.g. weights offloaded
+    in lowvram mode). Non-tensor conditioning values are frozen at capture time.
+
+    Args:
+        model: Loaded model (ModelPatcher)
+
+    Returns:
+        model: Clone of model with CUDA Graph wrapper set
+    """
+    m = model.clone()
+    # signature -> "warmup" | "eager" | (graph, static_x, static_t, static_c, static_out)
+    graphs = {}
+
+    def _signature(x, t, c):
+        tensors = tuple((k, tuple(v.shape), v.dtype) for k, v in sorted(c.items()) if isinstance(v, torch.Tensor))
+        return (tuple(x.shape), x.dtype, tuple(t.shape)) + tensors
+
+    def unet_wrapper(apply_model, args):
+        x, t, c = args["input"], args["timestep"], args["c"]
+        if not x.is_cuda:
+            return apply_model(x, t, **c)
+
+        key = _signature(x, t, c)
+        entry = graphs.get(key)
+        if entry is None:
+            graphs[key] = "warmup"
+            return apply_model(x, t, **c)
+        if entry == "eager":
+            return apply_model(x, t, **c)
+
+        if entry == "warmup":
+            try:
+                static_x = x.clone()
+                static_t = t.clone()
+                static_c = {k: v.clone() if isinstance(v, torch.Tensor) else v for k, v in c.items()}
+                graph = torch.cuda.CUDAGraph()
+                with torch.cuda.graph(graph):
+                    static_out = apply_model(static_x, static_t, **static_c)
+                entry = graphs[key] = (graph, static_x, static_t, static_c, static_out)
+            except Exception as e:
+                log.warning("cuda_graph_capture_failed", extra={"fallback": "eager", "error": str(e)})
+                graphs[key] = "eager"
+                return apply_model(x, t, **c)
+
+        graph, static_x, static_t, static_c, static_out = entry
+        static_x.copy_(x)
+        static_t.copy_(t)
+        for k, v in c.items():
+            if isinstance(v, torch.Tensor):
+                static_c[k].copy_(v)
+        graph.replay()
+        return static_out.clone()
+
+    m.set_model_unet_function_wrapper(unet_wrapper)
+    return m
+
+
+def torch_compile_model(model, mode: str = "reduce-overhead", backend: str = "inductor"):
+    """
+    Compile the diffusion model with torch.compile
+
+    Based on: TorchCompileModel from comfy_extras/nodes_torch_compile.py
+
+    Compilation happens lazily on the first sampling step and is reused while input
+    shapes stay the same (same resolution and frame count).
+
+    Args:
+        model: Loaded model (ModelPatcher)
+        mode: torch.compile mode ("reduce-overhead" also captures CUDA Graphs)
+        backend: torch.compile backend
+
+    Returns:
+        model: Clone of model with compiled diffusion_model
+    """
+    m = model.clone()
+    diffusion_model = m.get_model_object("diffusion_model")
+    m.add_object_patch(
+        "diffusion_model",
+        torch.compile(model=diffusion_model, mode=mode, backend=backend, fullgraph=False)
+    )
+    return m
+
+
 def load_lora(lora_path, model, clip, strength_model=1.0, strength_clip=1.0):
     """
     Load and apply LoRA to model and CLIP
@@ -1,9 +1,14 @@
 """
 Utilities for working with generation parameters
 """
-import json
+import asyncio
+import orjson
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+
+from logger import get_logger
+
+log = get_logger("generation_params")
 
 
 async def save_generation_params(
@@ -83,6 +88,43 @@ async def save_generation_params(
     # Create JSON path (same name, different extension)
     json_path = img_path.with_suffix('.json')
 
+    generation_data = build_generation_params(
+        img_path=img_path,
+        plugin_name=plugin_name,
+        plugin_version=plugin_version,
+        task_id=task_id,
+        timestamp=timestamp,
+        parameters=parameters,
+        project_id=project_id,
+        frame_id=frame_id
+    )
+    write_generation_params(str(json_path), generation_data)
+
+    return str(json_path)
+
+
+def build_generation_params(
+    img_path: Path,
+    plugin_name: str = None,
+    plugin_version: str = None,
+    task_id: int = None,
+    timestamp: str = None,
+    parameters: Dict[str, Any] = None,
+    project_id: Optional[int] = None,
+    frame_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Build generation parameters record stored in the JSON sidecar
+
+    Args:
+        img_path: Path to the generated image file
+        (other arguments as in save_generation_params)
+
+    Returns:
+        Dictionary to be written as JSON
+    """
+    img_path = Path(img_path)
+
     # Prepare generation data
     generation_data = {
         'plugin': plugin_name,
@@ -107,11 +149,67 @@ async def save_generation_params(
         if project_id is not None:
             generation_data['project_id'] = project_id
 
-    # Save to JSON file
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(generation_data, f, indent=2, ensure_ascii=False)
+    return generation_data
 
-    return str(json_path)
+
+def write_generation_params(json_path: str, generation_data: Dict[str, Any]) -> None:
+    """
+    Write generation parameters record to JSON file (blocking)
+
+    Args:
+        json_path: Path to the JSON sidecar file
+        generation_data: Record from build_generation_params()
+    """
+    with open(json_path, 'wb') as f:
+        f.write(orjson.dumps(generation_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
+
+def _write_generation_params_batch(records: List[Tuple[str, Dict[str, Any]]]) -> None:
+    """Write several sidecars in one worker-thread call"""
+    for json_path, generation_data in records:
+        try:
+            write_generation_params(json_path, generation_data)
+        except (IOError, OSError, TypeError, ValueError) as e:
+            log.warning("generation_params_save_failed", extra={"path": json_path, "error": str(e)})
+
+
+class GenerationParamsWriter:
+    """
+    Background writer for generation parameters sidecars
+
+    Records queued with put() are collected for `interval` seconds and written
+    in a single worker-thread call, so generation does not wait on file I/O.
+    Call flush() before the results are needed (end of task, stop).
+    """
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self._records: List[Tuple[str, Dict[str, Any]]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def put(self, json_path: str, generation_data: Dict[str, Any]) -> None:
+        """Queue record for writing (must be called from the event loop)"""
+        self._records.append((json_path, generation_data))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        """Drain queued records until there is nothing left"""
+        while True:
+            await asyncio.sleep(self.interval)
+            records, self._records = self._records, []
+            if not records:
+                return
+            await asyncio.to_thread(_write_generation_params_batch, records)
+
+    async def flush(self):
+        """Write all queued records and wait for the background writer"""
+        records, self._records = self._records, []
+        if records:
+            await asyncio.to_thread(_write_generation_params_batch, records)
+        if self._task is not None:
+            await self._task
+            self._task = None
 
 
 def load_generation_params(image_path: str) -> Optional[Dict[str, Any]]:
@@ -139,10 +237,10 @@ def load_generation_params(image_path: str) -> Optional[Dict[str, Any]]:
 
     # Load and return JSON data
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
-        print(f"Error loading generation params from {json_path}: {e}")
+        with open(json_path, 'rb') as f:
+            return orjson.loads(f.read())
+    except (orjson.JSONDecodeError, IOError) as e:
+        log.warning("generation_params_load_failed", extra={"path": str(json_path), "error": str(e)})
         return None
 
 
@@ -82,7 +82,8 @@ def load_unet_gguf(
     unet_name: str,
     dequant_dtype: str = "default",
     patch_dtype: str = "default",
-    patch_on_device: bool = False
+    patch_on_device: bool = False,
+    dtype: torch.dtype = None
 ):
     """
     Load diffusion model (UNET) in GGUF format.
@@ -104,6 +105,7 @@ def load_unet_gguf(
             - "target" - Use target dtype
             - "float32", "float16", "bfloat16" - Specific dtype
         patch_on_device: Whether to patch on device (False = offload, saves VRAM)
+        dtype: Compute dtype for the model weights (None = ComfyUI default)
 
     Returns:
         model: Loaded GGUF model wrapped in GGUFModelPatcher
@@ -126,7 +128,8 @@ def load_unet_gguf(
     sd = comfy.utils.load_torch_file(unet_path, safe_load=True)  # type: ignore
 
     # Load diffusion model
-    model = comfy.sd.load_diffusion_model_state_dict(sd)
+    model_options = {"dtype": dtype} if dtype is not None else {}
+    model = comfy.sd.load_diffusion_model_state_dict(sd, model_options=model_options)
 
     if model is None:
         logging.error(f"ERROR: Unsupported UNET {unet_path}")
@@ -11,6 +11,7 @@ These bricks provide building blocks for Wan image-to-video generation.
 import sys
 from pathlib import Path
 
+import numpy as np
 import torch
 
 # Add ComfyUI to Python path so internal imports work
@@ -26,6 +27,9 @@ import comfy.utils  # type: ignore
 import folder_paths  # type: ignore
 import node_helpers  # type: ignore
 
+# Side stream for host -> device image uploads (created on first use)
+_copy_stream = None
+
 
 def load_clip_vision(clip_name: str):
     """
@@ -72,6 +76,57 @@ def clip_vision_encode(clip_vision, image, crop="center"):
     return output
 
 
+def clip_vision_output_to_cpu(output):
+    """
+    Copy CLIP Vision output with all tensors moved to the CPU.
+
+    Used for outputs kept across tasks so they do not hold VRAM; ComfyUI moves
+    conditioning to the compute device when sampling.
+
+    Args:
+        output: CLIP Vision output (CLIP_VISION_OUTPUT type)
+
+    Returns:
+        output: New output of the same type with CPU tensors
+    """
+    cpu_output = type(output)()
+    for key, value in vars(output).items():
+        setattr(cpu_output, key, value.cpu() if isinstance(value, torch.Tensor) else value)
+    return cpu_output
+
+
+def pil_to_image_tensor(image):
+    """
+    Convert PIL image to ComfyUI IMAGE tensor.
+
+    Pixels stay uint8 on the CPU and go through pinned memory with a non-blocking
+    copy on a dedicated copy stream; the compute stream waits on an event recorded
+    after the copy. The float conversion and /255 scaling run on the device.
+
+    Args:
+        image: PIL Image (converted to RGB if needed)
+
+    Returns:
+        image: IMAGE tensor [1, H, W, 3] with values in 0..1
+    """
+    pixels = torch.from_numpy(np.array(image.convert("RGB"), dtype=np.uint8))
+    device = comfy.model_management.get_torch_device()
+    if device.type == "cuda":
+        global _copy_stream
+        if _copy_stream is None:
+            _copy_stream = torch.cuda.Stream(device)
+        pinned = pixels.pin_memory()
+        with torch.cuda.stream(_copy_stream):
+            pixels = pinned.to(device, non_blocking=True)
+            copied = torch.cuda.Event()
+            copied.record(_copy_stream)
+        compute_stream = torch.cuda.current_stream(device)
+        compute_stream.wait_event(copied)
+        # Allocated on the copy stream, used on the compute stream
+        pixels.record_stream(compute_stream)
+    return pixels.float().div_(255.0).unsqueeze(0)
+
+
 def load_clip(clip_name: str, clip_type: str = "stable_diffusion"):
     """
     Load CLIP text encoder in GGUF format.
@@ -2,9 +2,100 @@
 Database utilities and connection management
 """
 import aiosqlite
+import asyncio
 import os
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Sequence
+from datetime import datetime
 from pathlib import Path
 
+from logger import get_logger
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+DB_STATEMENT_CACHE_SIZE = 256
+
+# Page cache (negative = KiB) and memory-mapped I/O size for the shared connection
+DB_CACHE_SIZE_KIB = 64000
+DB_MMAP_SIZE = 256 * 1024 * 1024
+
+# Read-only connections serving fetch_one/fetch_all next to the single write connection
+# (WAL allows concurrent readers while a write is in progress)
+DB_READER_POOL_SIZE = min(4, os.cpu_count() or 1)
+
+# Rows per query when a list is streamed; the reader goes back to the pool between pages,
+# so a slow client never pins a reader connection (and its WAL snapshot)
+DB_STREAM_PAGE_SIZE = 500
+
+# Generated frame file name: project_{project_id}_frame_{base_frame_id}_variant_...
+_FRAME_NAME_RE = re.compile(r'project_\d+_frame_(\d+)_')
+
+# created_at/updated_at resolution: ISO string is reformatted at most this often (seconds)
+TIMESTAMP_RESOLUTION = 0.01
+_now_iso_cache = (float('-inf'), '')
+
+
+def utc_now_iso() -> str:
+    """Current UTC time as ISO string, cached for TIMESTAMP_RESOLUTION seconds"""
+    global _now_iso_cache
+    now = time.monotonic()
+    cached_at, value = _now_iso_cache
+    if now - cached_at >= TIMESTAMP_RESOLUTION:
+        value = datetime.utcnow().isoformat()
+        _now_iso_cache = (now, value)
+    return value
+
+
+def build_update_templates(
+    table: str,
+    always: Sequence[str],
+    optional: Sequence[str],
+    returning: Optional[str] = None
+) -> Dict[int, str]:
+    """
+    Precompute UPDATE ... WHERE id = ? statements for partial updates
+
+    Keyed by bitmask of the optional SET assignments used (bit i = optional[i]);
+    assignments of `always` come first, then the selected optional ones in order.
+    """
+    templates = {}
+    for mask in range(1 << len(optional)):
+        assignments = list(always) + [item for bit, item in enumerate(optional) if mask & (1 << bit)]
+        query = f"UPDATE {table} SET {', '.join(assignments)} WHERE id = ?"
+        if returning:
+            query += f" RETURNING {returning}"
+        templates[mask] = query
+    return templates
+
+
+class QueryCache:
+    """
+    Result of a read query kept until the next write to its table
+
+    Writers call invalidate() after their write committed. A reader takes
+    the version before querying and stores the result only if no write
+    happened meanwhile, so a stale result is never cached.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._value = None
+
+    def get(self):
+        """Cached result or None"""
+        return self._value
+
+    def set(self, version: int, value) -> None:
+        """Store result read at `version` (dropped if a write happened since)"""
+        if version == self.version:
+            self._value = value
+
+    def invalidate(self) -> None:
+        """Drop cached result (call after the write)"""
+        self.version += 1
+        self._value = None
+
 
 class Database:
     """Database connection manager"""
@@ -12,6 +103,12 @@ class Database:
     def __init__(self, db_path: str):
         self.db_path = db_path
         self.connection = None
+        # All coroutines share one connection: writes (and their commit) must not interleave,
+        # otherwise a commit from one coroutine ends another one's open transaction
+        self._write_lock = asyncio.Lock()
+        self._readers: list = []
+        self._reader_pool: asyncio.Queue = None
+        self.wal_enabled = False
 
     async def connect(self):
         """Establish database connection"""
@@ -19,14 +116,59 @@ class Database:
         db_dir = Path(self.db_path).parent
         db_dir.mkdir(parents=True, exist_ok=True)
 
-        self.connection = await aiosqlite.connect(self.db_path)
+        # sqlite3 keeps prepared statements in a per-connection LRU keyed by SQL text;
+        # queries use ? placeholders so the hot ones are parsed and planned only once
+        self.connection = await aiosqlite.connect(self.db_path, cached_statements=DB_STATEMENT_CACHE_SIZE)
         self.connection.row_factory = aiosqlite.Row
 
+        # Connection tuning: WAL lets readers run alongside the writer, NORMAL sync
+        # is durable in WAL mode without fsync on every commit
+        async with self.connection.execute("PRAGMA journal_mode=WAL") as cursor:
+            journal_mode = (await cursor.fetchone())[0]
+        self.wal_enabled = journal_mode.lower() == 'wal'
+        if not self.wal_enabled:
+            get_logger("database").warning(
+                "wal_unavailable", extra={"db_path": self.db_path, "journal_mode": journal_mode}
+            )
+        await self.connection.execute("PRAGMA synchronous=NORMAL")
+        await self.connection.execute("PRAGMA temp_store=MEMORY")
+        await self.connection.execute(f"PRAGMA cache_size=-{DB_CACHE_SIZE_KIB}")
+        await self.connection.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE}")
+        # Enforce FOREIGN KEY constraints (off by default in SQLite)
+        await self.connection.execute("PRAGMA foreign_keys=ON")
+
         # Initialize tables
         await self._init_tables()
 
+        # Reader pool is opened once the schema (and WAL file) exists; without WAL
+        # readers would block the writer, so everything stays on the write connection
+        if not self.wal_enabled:
+            return
+        self._reader_pool = asyncio.Queue()
+        for _ in range(DB_READER_POOL_SIZE):
+            reader = await self._connect_reader()
+            self._readers.append(reader)
+            self._reader_pool.put_nowait(reader)
+
+    async def _connect_reader(self):
+        """Open a read-only connection with the same tuning as the write connection"""
+        reader = await aiosqlite.connect(
+            f"file:{Path(self.db_path).resolve()}?mode=ro",
+            uri=True,
+            cached_statements=DB_STATEMENT_CACHE_SIZE
+        )
+        reader.row_factory = aiosqlite.Row
+        await reader.execute("PRAGMA temp_store=MEMORY")
+        await reader.execute(f"PRAGMA cache_size=-{DB_CACHE_SIZE_KIB}")
+        await reader.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE}")
+        return reader
+
     async def disconnect(self):
         """Close database connection"""
+        for reader in self._readers:
+            await reader.close()
+        self._readers = []
+        self._reader_pool = None
         if self.connection:
             await self.connection.close()
 
@@ -46,6 +188,11 @@ class Database:
                 )
             """)
 
+            # get_all_projects: ORDER BY created_at DESC served by index scan instead of a sort
+            await cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_projects_created_at ON projects (created_at DESC)
+            """)
+
             # Frames table
             await cursor.execute("""
                 CREATE TABLE IF NOT EXISTS frames (
@@ -54,6 +201,7 @@ class Database:
                     generator TEXT NOT NULL,
                     project_id INTEGER NOT NULL,
                     variant_id INTEGER NOT NULL DEFAULT 0,
+                    parent_frame_id INTEGER,
                     created_at TEXT NOT NULL,
                     updated_at TEXT NOT NULL,
                     FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE
@@ -70,6 +218,11 @@ class Database:
                 CREATE INDEX IF NOT EXISTS idx_frames_project_variant ON frames (project_id, variant_id)
             """)
 
+            # Keyset pagination of project frames: ORDER BY created_at, id served by index
+            await cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_frames_project_created ON frames (project_id, created_at, id)
+            """)
+
             # Migration: Add variant_id column if it doesn't exist
             await cursor.execute("""
                 PRAGMA table_info(frames)
@@ -85,6 +238,28 @@ class Database:
                     CREATE INDEX IF NOT EXISTS idx_frames_project_variant ON frames (project_id, variant_id)
                 """)
 
+            # Migration: Add parent_frame_id column (id of the first frame of a variant group)
+            if 'parent_frame_id' not in column_names:
+                await cursor.execute("""
+                    ALTER TABLE frames ADD COLUMN parent_frame_id INTEGER
+                """)
+                await self._backfill_parent_frame_ids(cursor)
+
+            # Variant lookups: WHERE parent_frame_id = ? ORDER BY variant_id
+            await cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_frames_parent ON frames (parent_frame_id, variant_id)
+            """)
+
+            # Frames inserted without a parent are the base of their own variant group
+            await cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_frames_parent_default
+                AFTER INSERT ON frames
+                WHEN NEW.parent_frame_id IS NULL
+                BEGIN
+                    UPDATE frames SET parent_frame_id = NEW.id WHERE id = NEW.id;
+                END
+            """)
+
             # Tasks table (for generator system)
             await cursor.execute("""
                 CREATE TABLE IF NOT EXISTS tasks (
@@ -113,6 +288,11 @@ class Database:
                 CREATE INDEX IF NOT EXISTS idx_tasks_type ON tasks (type)
             """)
 
+            # get_all_tasks: ORDER BY created_at DESC served by index scan instead of a sort
+            await cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks (created_at DESC)
+            """)
+
             # Example: Create a simple users table
             await cursor.execute("""
                 CREATE TABLE IF NOT EXISTS users (
@@ -137,22 +317,92 @@ class Database:
 
             await self.connection.commit()
 
+    async def _backfill_parent_frame_ids(self, cursor):
+        """
+        Fill parent_frame_id of existing frames from their file names
+
+        Variants are named project_{project_id}_frame_{base_frame_id}_variant_{variant_id}...,
+        frames with other names (or whose base frame is gone) become their own parent.
+        """
+        await cursor.execute("SELECT id, path FROM frames")
+        rows = await cursor.fetchall()
+        frame_ids = {row[0] for row in rows}
+
+        updates = []
+        for frame_id, path in rows:
+            match = _FRAME_NAME_RE.match(os.path.basename(path))
+            parent_id = int(match.group(1)) if match else frame_id
+            updates.append((parent_id if parent_id in frame_ids else frame_id, frame_id))
+
+        await cursor.executemany("UPDATE frames SET parent_frame_id = ? WHERE id = ?", updates)
+
     async def execute(self, query: str, params: tuple = ()):
         """Execute a query"""
-        async with self.connection.cursor() as cursor:
+        async with self.transaction() as cursor:
             await cursor.execute(query, params)
-            await self.connection.commit()
             return cursor.lastrowid
 
+    async def execute_count(self, query: str, params: tuple = ()) -> int:
+        """Execute a write query and return the number of affected rows"""
+        async with self.transaction() as cursor:
+            await cursor.execute(query, params)
+            return cursor.rowcount
+
+    async def execute_returning(self, query: str, params: tuple = ()):
+        """Execute a write query with RETURNING clause and return the returned rows"""
+        async with self.transaction() as cursor:
+            await cursor.execute(query, params)
+            return await cursor.fetchall()
+
+    async def execute_returning_one(self, query: str, params: tuple = ()):
+        """Execute a write query with RETURNING clause and return the first returned row"""
+        async with self.transaction() as cursor:
+            await cursor.execute(query, params)
+            return await cursor.fetchone()
+
+    async def execute_many(self, query: str, params_seq):
+        """Execute a query for every params tuple in a single transaction"""
+        async with self.transaction() as cursor:
+            await cursor.executemany(query, params_seq)
+
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Run several statements on one cursor in a single transaction
+
+        Commits when the block exits normally, rolls back on error. All execute_*
+        helpers go through here, so a failed write (e.g. executemany stopping halfway)
+        never leaves applied rows in the open transaction for the next commit.
+        """
+        async with self._write_lock, self.connection.cursor() as cursor:
+            try:
+                yield cursor
+            except Exception:
+                await self.connection.rollback()
+                raise
+            await self.connection.commit()
+
+    @asynccontextmanager
+    async def _reader(self):
+        """Borrow a read-only connection from the pool (write connection before connect())"""
+        if self._reader_pool is None:
+            yield self.connection
+            return
+        reader = await self._reader_pool.get()
+        try:
+            yield reader
+        finally:
+            self._reader_pool.put_nowait(reader)
+
     async def fetch_one(self, query: str, params: tuple = ()):
         """Fetch one row"""
-        async with self.connection.cursor() as cursor:
+        async with self._reader() as connection, connection.cursor() as cursor:
             await cursor.execute(query, params)
             return await cursor.fetchone()
 
     async def fetch_all(self, query: str, params: tuple = ()):
         """Fetch all rows"""
-        async with self.connection.cursor() as cursor:
+        async with self._reader() as connection, connection.cursor() as cursor:
             await cursor.execute(query, params)
             return await cursor.fetchall()
 
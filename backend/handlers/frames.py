@@ -1,20 +1,62 @@
 """
 Frame handlers (controllers)
 """
+import asyncio
+
 from aiohttp import web
 from pydantic import ValidationError
 
 from database import get_db
-from services.frame_service import FrameService
+from services.frame_service import FrameService, encode_frame_cursor, decode_frame_cursor
 from models.frame import FrameCreate, FrameUpdate, FrameListResponse
-from bricks.generation_params import load_generation_params, params_exist
+from bricks.generation_params import load_generation_params
+from handlers.ndjson import wants_ndjson, stream_ndjson
+
+
+MAX_PAGE_LIMIT = 1000
+
+
+def _parse_page_params(request: web.Request):
+    """
+    Parse optional limit/cursor pagination query params
+
+    Returns (limit, cursor); raises ValueError on invalid values
+    """
+    limit = request.query.get('limit')
+    cursor = request.query.get('cursor')
+
+    if limit is not None:
+        limit = int(limit)
+        if limit < 1 or limit > MAX_PAGE_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_LIMIT}")
+
+    if cursor is not None:
+        decode_frame_cursor(cursor)  # Validate
+
+    return limit, cursor
+
+
+def _frame_list_response(frames, limit) -> web.Response:
+    """Build frame list response with next_cursor for full pages"""
+    next_cursor = None
+    if limit is not None and len(frames) == limit:
+        next_cursor = encode_frame_cursor(frames[-1])
+
+    response = FrameListResponse(
+        total=len(frames),
+        frames=frames,
+        next_cursor=next_cursor
+    )
+
+    return web.json_response(response.model_dump(), status=200)
 
 
 async def list_frames(request: web.Request) -> web.Response:
     """
     Get all frames, optionally filtered by project_id
 
-    GET /api/v1/frames?project_id={id}
+    GET /api/v1/frames?project_id={id}&limit={n}&cursor={next_cursor}
+    With ?format=ndjson streams one frame per line instead of a list
     """
     try:
         # Get optional project_id filter from query params
@@ -28,17 +70,26 @@ async def list_frames(request: web.Request) -> web.Response:
                     'message': 'Invalid project_id parameter'
                 }, status=400)
 
+        try:
+            limit, cursor = _parse_page_params(request)
+        except ValueError as e:
+            return web.json_response({
+                'error': 'Bad request',
+                'message': f'Invalid pagination parameters: {e}'
+            }, status=400)
+
         db = get_db()
         service = FrameService(db)
 
-        frames = await service.get_all_frames(project_id=project_id)
+        if wants_ndjson(request):
+            return await stream_ndjson(
+                request,
+                service.iter_all_frames(project_id=project_id, limit=limit, cursor=cursor)
+            )
 
-        response = FrameListResponse(
-            total=len(frames),
-            frames=frames
-        )
+        frames = await service.get_all_frames(project_id=project_id, limit=limit, cursor=cursor)
 
-        return web.json_response(response.model_dump(), status=200)
+        return _frame_list_response(frames, limit)
 
     except Exception as e:
         return web.json_response({
@@ -205,22 +256,32 @@ async def get_project_frames(request: web.Request) -> web.Response:
     """
     Get all frames for a specific project
 
-    GET /api/v1/projects/{id}/frames
+    GET /api/v1/projects/{id}/frames?limit={n}&cursor={next_cursor}
+    With ?format=ndjson streams one frame per line instead of a list
     """
     try:
         project_id = int(request.match_info['id'])
 
+        try:
+            limit, cursor = _parse_page_params(request)
+        except ValueError as e:
+            return web.json_response({
+                'error': 'Bad request',
+                'message': f'Invalid pagination parameters: {e}'
+            }, status=400)
+
         db = get_db()
         service = FrameService(db)
 
-        frames = await service.get_frames_by_project(project_id)
+        if wants_ndjson(request):
+            return await stream_ndjson(
+                request,
+                service.iter_all_frames(project_id=project_id, limit=limit, cursor=cursor)
+            )
 
-        response = FrameListResponse(
-            total=len(frames),
-            frames=frames
-        )
+        frames = await service.get_all_frames(project_id=project_id, limit=limit, cursor=cursor)
 
-        return web.json_response(response.model_dump(), status=200)
+        return _frame_list_response(frames, limit)
 
     except ValueError:
         return web.json_response({
@@ -255,14 +316,14 @@ async def get_frame_generation_params(request: web.Request) -> web.Response:
                 'message': f'Frame with id {frame_id} not found'
             }, status=404)
 
-        # Load generation params from JSON file
-        if not params_exist(frame.path):
+        # Load generation params from JSON file (blocking read runs in a worker thread)
+        params = await asyncio.to_thread(load_generation_params, frame.path)
+        if params is None:
             return web.json_response({
                 'error': 'Not found',
                 'message': 'Generation parameters not found for this frame'
             }, status=404)
 
-        params = load_generation_params(frame.path)
         return web.json_response(params, status=200)
 
     except ValueError:
@@ -7,23 +7,64 @@ from pydantic import ValidationError
 from database import get_db
 from services.generator_service import GeneratorService
 from models.task import TaskCreate, TaskListResponse
+from handlers.ndjson import wants_ndjson, stream_ndjson
+
+
+MAX_PAGE_LIMIT = 1000
+
+
+def _parse_page_params(request: web.Request):
+    """
+    Parse optional limit/before_id pagination query params
+
+    Returns (limit, before_id); raises ValueError on invalid values
+    """
+    limit = request.query.get('limit')
+    before_id = request.query.get('before_id')
+
+    if limit is not None:
+        limit = int(limit)
+        if limit < 1 or limit > MAX_PAGE_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_LIMIT}")
+
+    if before_id is not None:
+        before_id = int(before_id)
+
+    return limit, before_id
 
 
 async def list_tasks(request: web.Request) -> web.Response:
     """
-    Get all tasks
+    Get all tasks, newest first
 
-    GET /api/v1/generator/tasks
+    GET /api/v1/generator/tasks?limit={n}&before_id={next_before_id}
+    With ?format=ndjson streams one task per line instead of a list
     """
     try:
+        try:
+            limit, before_id = _parse_page_params(request)
+        except ValueError as e:
+            return web.json_response({
+                'error': 'Bad request',
+                'message': f'Invalid pagination parameters: {e}'
+            }, status=400)
+
         db = get_db()
         service = GeneratorService(db)
 
-        tasks = await service.get_all_tasks()
+        if wants_ndjson(request):
+            return await stream_ndjson(request, service.iter_all_tasks(limit=limit, before_id=before_id))
+
+        tasks = await service.get_all_tasks(limit=limit, before_id=before_id)
+
+        next_before_id = None
+        if limit is not None and len(tasks) == limit:
+            next_before_id = tasks[-1].id
 
         response = TaskListResponse(
             total=len(tasks),
-            tasks=tasks
+            tasks=tasks,
+            next_before_id=next_before_id
         )
 
         return web.json_response(response.model_dump(), status=200)
@@ -209,21 +250,18 @@ async def get_task_progress(request: web.Request) -> web.Response:
         db = get_db()
         service = GeneratorService(db)
 
-        # Get task to check if it exists
-        task = await service.get_task_by_id(task_id)
+        # DB row plus the latest tick not flushed yet
+        task = await service.get_task_with_progress(task_id)
         if not task:
             return web.json_response({
                 'error': 'Not found',
                 'message': f'Task with id {task_id} not found'
             }, status=404)
 
-        # Get live progress if task is running
-        live_progress = service.get_task_progress(task_id)
-
         return web.json_response({
             'task_id': task_id,
             'status': task.status.value,
-            'progress': live_progress if live_progress is not None else task.progress
+            'progress': task.progress
         }, status=200)
 
     except ValueError:
@@ -249,19 +287,12 @@ async def get_plugins(request: web.Request) -> web.Response:
         db = get_db()
         service = GeneratorService(db)
 
-        all_plugins = service.get_available_plugins()
-
-        # Filter only visible plugins (default to True if not specified)
-        visible_plugins = {
-            name: info
-            for name, info in all_plugins.items()
-            if info.get('visible', True)  # Show by default if not specified
-        }
-
-        return web.json_response({
-            'total': len(visible_plugins),
-            'plugins': visible_plugins
-        }, status=200)
+        # Visible plugins only, serialized once and reused until plugins are reloaded
+        return web.Response(
+            body=service.get_available_plugins_json(),
+            content_type='application/json',
+            status=200
+        )
 
     except Exception as e:
         return web.json_response({
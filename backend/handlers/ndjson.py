@@ -0,0 +1,59 @@
+"""
+Newline-delimited JSON streaming for list endpoints
+"""
+from typing import AsyncGenerator
+
+import orjson
+from aiohttp import web
+from pydantic import BaseModel
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+# Lines are buffered and written in chunks of roughly this size (bytes)
+NDJSON_CHUNK_SIZE = 64 * 1024
+
+
+def wants_ndjson(request: web.Request) -> bool:
+    """Client asked for a streamed list (?format=ndjson or Accept: application/x-ndjson)"""
+    if request.query.get('format') == 'ndjson':
+        return True
+    return NDJSON_CONTENT_TYPE in request.headers.get('Accept', '')
+
+
+async def stream_ndjson(request: web.Request, items: AsyncGenerator[BaseModel, None]) -> web.StreamResponse:
+    """
+    Stream models as one JSON object per line
+
+    Errors after the headers were sent are reported as a final
+    {"error": ..., "message": ...} line, unless the client is already gone.
+    The items generator is always closed, also when the client disconnects.
+    """
+    response = web.StreamResponse(status=200, headers={'Content-Type': NDJSON_CONTENT_TYPE})
+    await response.prepare(request)
+
+    buffer = bytearray()
+    try:
+        async for item in items:
+            buffer += orjson.dumps(item.model_dump(mode='json'))
+            buffer += b'\n'
+            if len(buffer) >= NDJSON_CHUNK_SIZE:
+                await response.write(bytes(buffer))
+                buffer.clear()
+    except ConnectionResetError:
+        # Client disconnected, nothing more can be written
+        return response
+    except Exception as e:
+        if request.transport is None or request.transport.is_closing():
+            return response
+        buffer += orjson.dumps({'error': 'Internal server error', 'message': str(e)})
+        buffer += b'\n'
+    finally:
+        await items.aclose()
+
+    try:
+        if buffer:
+            await response.write(bytes(buffer))
+        await response.write_eof()
+    except ConnectionResetError:
+        pass
+    return response
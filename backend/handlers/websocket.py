@@ -3,15 +3,84 @@ WebSocket handler for real-time updates
 """
 from aiohttp import web, WSMsgType
 import asyncio
-import json
 import weakref
-from services.system_monitor import SystemMonitor
+import orjson
 from logger import get_logger
 
 
 # Global set of connected WebSocket clients
 websockets: weakref.WeakSet = weakref.WeakSet()
 
+# Broadcast batching
+BROADCAST_FLUSH_DELAY = 0.05  # Seconds to collect packets before sending them together
+BROADCAST_MAX_PACKETS = 140  # Flush immediately once this many packets are buffered
+BROADCAST_CLIENT_CHUNK = 50  # Clients served before yielding to the event loop
+
+# Reply to client pings, serialized once
+PONG_MESSAGE = orjson.dumps({'type': 'pong'}).decode()
+
+
+def batch_message(packets: list) -> dict:
+    """Wrap buffered packets into one message (single packet is sent unchanged)"""
+    if len(packets) == 1:
+        return packets[0]
+    return {'type': 'batch', 'packets': packets}
+
+
+class PendingBroadcast:
+    """
+    Buffer of broadcast packets sent as one WebSocket message per client
+
+    Packets added within `delay` seconds are combined by `build_message`
+    (default: {'type': 'batch', 'packets': [...]}) and serialized once.
+    """
+
+    def __init__(
+        self,
+        delay: float = BROADCAST_FLUSH_DELAY,
+        max_packets: int = BROADCAST_MAX_PACKETS,
+        build_message=batch_message
+    ):
+        self.delay = delay
+        self.max_packets = max_packets
+        self.build_message = build_message
+        self._packets = []
+        self._timer = None
+        self._tasks = set()  # Keep references to running flushes
+
+    def add(self, packet: dict):
+        """Buffer packet and schedule flush (must be called from the event loop)"""
+        self._packets.append(packet)
+        if len(self._packets) >= self.max_packets:
+            self._flush_soon()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.delay, self._flush_soon)
+
+    def _take_packets(self) -> list:
+        """Cancel pending timer and return buffered packets"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        packets, self._packets = self._packets, []
+        return packets
+
+    def _flush_soon(self):
+        """Send buffered packets in a background task"""
+        packets = self._take_packets()
+        if not packets:
+            return
+        task = asyncio.create_task(broadcast_text(orjson.dumps(self.build_message(packets)).decode()))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self):
+        """Send buffered packets now and wait for in-flight flushes"""
+        packets = self._take_packets()
+        if packets:
+            await broadcast_text(orjson.dumps(self.build_message(packets)).decode())
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
 
 async def websocket_handler(request: web.Request) -> web.WebSocketResponse:
     """
@@ -24,7 +93,8 @@ async def websocket_handler(request: web.Request) -> web.WebSocketResponse:
     - Task queue status
     - Current task progress
     """
-    ws = web.WebSocketResponse(heartbeat=10.0)
+    # No permessage-deflate: messages are small JSON (already batched), zlib per send costs more than it saves
+    ws = web.WebSocketResponse(heartbeat=10.0, compress=False)
     await ws.prepare(request)
 
     log = get_logger("ws")
@@ -33,7 +103,7 @@ async def websocket_handler(request: web.Request) -> web.WebSocketResponse:
 
     # Get services
     generator_service = request.app.get('generator_service')
-    system_monitor = SystemMonitor()
+    system_monitor = request.app['system_monitor']
 
     log.info("client_connected", extra={"total_clients": len(websockets)})
 
@@ -42,7 +112,7 @@ async def websocket_handler(request: web.Request) -> web.WebSocketResponse:
         try:
             while not ws.closed:
                 # Collect data
-                metrics = system_monitor.get_metrics()
+                metrics = await system_monitor.get_metrics_cached()
 
                 # Get task queue info
                 pending_count = 0
@@ -107,18 +177,18 @@ async def websocket_handler(request: web.Request) -> web.WebSocketResponse:
         async for msg in ws:
             if msg.type == WSMsgType.TEXT:
                 try:
-                    data = json.loads(msg.data)
+                    data = orjson.loads(msg.data)
                     msg_type = data.get('type')
 
                     if msg_type == 'ping':
                         # Respond to ping
-                        await ws.send_json({'type': 'pong'})
+                        await ws.send_str(PONG_MESSAGE)
 
                     elif msg_type == 'close':
                         await ws.close()
                         break
 
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     log.warning("invalid_json", extra={"data": msg.data[:256]})
 
             elif msg.type == WSMsgType.ERROR:
@@ -147,16 +217,31 @@ async def broadcast_message(message: dict):
     Args:
         message: Dictionary to send as JSON
     """
+    await broadcast_text(orjson.dumps(message).decode())
+
+
+async def broadcast_text(text: str):
+    """
+    Send pre-serialized JSON text to all connected WebSocket clients
+
+    Message is serialized once for all clients; the loop yields every
+    BROADCAST_CLIENT_CHUNK clients so large broadcasts don't stall it.
+
+    Args:
+        text: JSON string to send
+    """
     disconnected = set()
 
-    for ws in websockets:
+    for idx, ws in enumerate(list(websockets)):
+        if idx and idx % BROADCAST_CLIENT_CHUNK == 0:
+            await asyncio.sleep(0)
         try:
             if ws.closed:
                 disconnected.add(ws)
             else:
-                await ws.send_json(message)
+                await ws.send_str(text)
         except Exception as e:
-            print(f"Error broadcasting to client: {e}")
+            get_logger("ws").debug("broadcast_failed", extra={"error": str(e)})
             disconnected.add(ws)
 
     # Clean up disconnected clients
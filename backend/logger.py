@@ -1,5 +1,8 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
 
 
@@ -25,7 +28,14 @@ def setup_logging() -> logging.Logger:
         datefmt="%Y-%m-%dT%H:%M:%S",
     )
     stream_handler.setFormatter(formatter)
-    logger.addHandler(stream_handler)
+
+    # Records are handed to a background thread, so logging from the event loop
+    # never blocks on a slow stdout (pipe, container log driver)
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(records, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    logger.addHandler(logging.handlers.QueueHandler(records))
 
     return logger
 
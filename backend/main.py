@@ -7,13 +7,22 @@ from aiohttp_pydantic import oas
 from dotenv import load_dotenv
 import os
 
-from routes import setup_routes
-from database import init_db, close_db, get_db, Database
+# Stream-ordered CUDA allocator: per-variant latents are freed asynchronously and
+# reused from the pool. Must be set before torch is imported (via the plugins below).
+os.environ.setdefault('PYTORCH_CUDA_ALLOC_CONF', 'backend:cudaMallocAsync')
+
+from routes import setup_routes, FRAMES_URL_PREFIX
+from database import init_db, close_db, get_db, Database, utc_now_iso
 from services.generator_service import GeneratorService
+from services.system_monitor import SystemMonitor
 from handlers import websocket
-from datetime import datetime
 from logger import setup_logging, get_logger
 
+try:
+    import uvloop  # Faster event loop (Linux/macOS only)
+except ImportError:
+    uvloop = None
+
 
 @web.middleware
 async def cors_middleware(request, handler):
@@ -34,28 +43,33 @@ async def cors_middleware(request, handler):
     return response
 
 
+@web.middleware
+async def frames_cache_middleware(request, handler):
+    """Let browsers cache frame images but revalidate them on every use"""
+    response = await handler(request)
+    # Frame files are overwritten in place (live preview, regeneration), so they are not
+    # immutable: revalidation is answered with 304 via Last-Modified/ETag when unchanged
+    if request.path.startswith(FRAMES_URL_PREFIX + '/'):
+        response.headers['Cache-Control'] = 'public, no-cache'
+    return response
+
+
 async def cleanup_stuck_tasks(db: Database):
     """Clean up any running tasks that were left from previous sessions"""
     try:
-        # Find all tasks with 'running' status
-        query = "SELECT id, name FROM tasks WHERE status = 'running'"
-        rows = await db.fetch_all(query)
-
-        if rows:
-            print(f"Found {len(rows)} stuck running tasks, cleaning up...")
-            current_time = datetime.now().isoformat()
-
-            # Update all running tasks to stopped status
-            for row in rows:
-                task_id, task_name = row
-                await db.execute(
-                    "UPDATE tasks SET status = 'stopped', progress = 0.0, updated_at = ?, error = ? WHERE id = ?",
-                    (current_time, "Task stopped due to server restart", task_id)
-                )
-                print(f"  - Stopped task ID {task_id}: {task_name}")
-
-            await db.commit()
-            print("Stuck tasks cleanup completed")
+        # Single UPDATE for all tasks left in 'running' status
+        now = utc_now_iso()
+        stopped_count = await db.execute_count(
+            """
+            UPDATE tasks
+            SET status = 'stopped', progress = 0.0, updated_at = ?, completed_at = ?, error = ?
+            WHERE status = 'running'
+            """,
+            (now, now, "Task stopped due to server restart")
+        )
+
+        if stopped_count:
+            print(f"Stopped {stopped_count} stuck running tasks")
         else:
             print("No stuck running tasks found")
 
@@ -75,6 +89,9 @@ async def on_startup(app: web.Application):
     app['generator_service'] = GeneratorService(db)
     log.info("Generator service initialized")
 
+    # One system monitor shared by all WebSocket clients (keeps NVML initialized)
+    app['system_monitor'] = SystemMonitor()
+
     # Clean up any stuck running tasks from previous sessions
     await cleanup_stuck_tasks(db)
 
@@ -84,6 +101,8 @@ async def on_cleanup(app: web.Application):
     log = get_logger("cleanup")
     # Close WebSocket connections
     await websocket.on_shutdown(app)
+    # Release NVML
+    app['system_monitor'].close()
     # Close database
     await close_db()
     log.info("Database connection closed")
@@ -95,7 +114,7 @@ def create_app() -> web.Application:
     setup_logging()
     log = get_logger("bootstrap")
 
-    app = web.Application(middlewares=[cors_middleware])
+    app = web.Application(middlewares=[cors_middleware, frames_cache_middleware])
 
     # Setup lifecycle handlers
     app.on_startup.append(on_startup)
@@ -123,8 +142,11 @@ def main():
     port = int(os.getenv('PORT', 8000))
     host = os.getenv('HOST', '0.0.0.0')
 
-    get_logger("server").info("Starting server", extra={"host": host, "port": port})
-    web.run_app(app, host=host, port=port)
+    # uvloop when installed, default asyncio loop otherwise
+    loop = uvloop.new_event_loop() if uvloop is not None else None
+
+    get_logger("server").info("Starting server", extra={"host": host, "port": port, "uvloop": loop is not None})
+    web.run_app(app, host=host, port=port, loop=loop)
 
 
 if __name__ == '__main__':
@@ -12,6 +12,9 @@ class FrameBase(BaseModel):
     generator: str = Field(..., min_length=1, max_length=255, description="Generator information")
     project_id: int = Field(..., gt=0, description="Project ID this frame belongs to")
     variant_id: int = Field(default=0, ge=0, description="Variant ID for this frame")
+    parent_frame_id: Optional[int] = Field(
+        default=None, gt=0, description="First frame of the variant group (defaults to the frame itself)"
+    )
 
     @field_validator('path')
     @classmethod
@@ -57,4 +60,5 @@ class FrameListResponse(BaseModel):
     """Model for list of frames response"""
     total: int
     frames: list[FrameResponse]
+    next_cursor: Optional[str] = None  # Set when more pages are available (limit was used)
 
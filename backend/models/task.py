@@ -73,4 +73,5 @@ class TaskListResponse(BaseModel):
     """Model for list of tasks response"""
     total: int
     tasks: list[TaskResponse]
+    next_before_id: Optional[int] = None  # Set when more pages are available (limit was used)
 
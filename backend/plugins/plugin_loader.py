@@ -6,7 +6,9 @@ Each plugin must be in its own directory with a loader.py file.
 """
 import os
 import importlib
-from typing import Dict, Type, Optional
+from types import MappingProxyType
+from typing import Dict, Mapping, Type, Optional
+import orjson
 from pathlib import Path
 from .base_plugin import BasePlugin
 
@@ -15,11 +17,16 @@ class PluginRegistry:
     """Registry for all available plugins"""
 
     _plugins: Dict[str, Type[BasePlugin]] = {}
+    # get_all_plugins() result, built once (plugin info may instantiate loaders)
+    _plugins_info: Optional[Mapping[str, Dict]] = None
+    # Serialized GET /generator/plugins response (visible plugins only)
+    _visible_plugins_json: Optional[bytes] = None
 
     @classmethod
     def register(cls, plugin_type: str, plugin_class: Type[BasePlugin]):
         """Register a plugin"""
         cls._plugins[plugin_type] = plugin_class
+        cls.refresh_plugins()
 
     @classmethod
     def get_plugin(cls, plugin_type: str) -> Optional[Type[BasePlugin]]:
@@ -27,12 +34,35 @@ class PluginRegistry:
         return cls._plugins.get(plugin_type)
 
     @classmethod
-    def get_all_plugins(cls) -> Dict[str, Dict]:
-        """Get information about all registered plugins"""
-        result = {}
-        for plugin_type, plugin_class in cls._plugins.items():
-            result[plugin_type] = plugin_class.get_plugin_info()
-        return result
+    def get_all_plugins(cls) -> Mapping[str, Dict]:
+        """Get information about all registered plugins (cached read-only view)"""
+        if cls._plugins_info is None:
+            result = {}
+            for plugin_type, plugin_class in cls._plugins.items():
+                result[plugin_type] = plugin_class.get_plugin_info()
+            cls._plugins_info = MappingProxyType(result)
+        return cls._plugins_info
+
+    @classmethod
+    def refresh_plugins(cls):
+        """Drop cached plugin information (rebuilt on next get_all_plugins)"""
+        cls._plugins_info = None
+        cls._visible_plugins_json = None
+
+    @classmethod
+    def get_visible_plugins_json(cls) -> bytes:
+        """JSON body {"total", "plugins"} of plugins not hidden with visible=False, serialized once"""
+        if cls._visible_plugins_json is None:
+            visible_plugins = {
+                name: info
+                for name, info in cls.get_all_plugins().items()
+                if info.get('visible', True)  # Show by default if not specified
+            }
+            cls._visible_plugins_json = orjson.dumps({
+                'total': len(visible_plugins),
+                'plugins': visible_plugins
+            })
+        return cls._visible_plugins_json
 
     @classmethod
     def is_registered(cls, plugin_type: str) -> bool:
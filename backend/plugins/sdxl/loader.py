@@ -343,7 +343,8 @@ class SDXLLoader:
                         path=temp_path,  # Temporary path
                         generator='sdxl',
                         project_id=project_id,
-                        variant_id=variant_idx
+                        variant_id=variant_idx,
+                        parent_frame_id=base_frame_id
                     )
 
                     created_frame = await self.frame_service.create_frame(frame_create)
@@ -1,8 +1,14 @@
 """
 Wan22-I2V Plugin Loader for Video Generation
 """
+import io
 import os
 import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional, Callable
@@ -17,6 +23,7 @@ from bricks import wan_bricks
 from bricks.preview_bricks import create_preview_callback
 from bricks import comfy_bricks  # Import for KSampler and VAE decode
 from bricks import gguf_bricks  # Import for GGUF model loading
+import comfy.model_management  # type: ignore  # ComfyUI is on sys.path once bricks are imported
 from logger import setup_logging
 from ..base_plugin import BasePlugin
 
@@ -40,9 +47,203 @@ WAN22_STEPS = 4  # Always 4 steps for Wan22-I2V
 WAN22_SPLIT = 2  # Split between High and Low noise models
 WAN22_CFG_SCALE = 1.0  # Always 1.0 for Wan22-I2V
 
+# CLIP Vision model used to encode the previous frame
+CLIP_VISION_MODEL = "clip_vision_h.safetensors"
+CLIP_VISION_CACHE_SIZE = 8  # Encoded previous frames kept in CPU memory
+
+# Sequence output format:
+# - 'png': one PNG per frame (seq_###.png)
+# - 'webp_animated': seq_000.png thumbnail + one animated WebP with all frames
+WAN22_OUTPUT_FORMAT = 'png'
+WAN22_PNG_COMPRESS_LEVEL = 1  # zlib level for sequence PNGs (PIL default 6 is ~5x slower)
+
+# Keep UNet Conv3d weights and video latents in channels_last_3d (NDHWC) layout so cuDNN
+# can use tensor-core kernels. Gains depend on GPU architecture - A/B test before enabling.
+WAN22_CHANNELS_LAST = False
+
+# Capture UNet forward into CUDA Graphs and replay it for following steps with the same shapes.
+# Needs the model fully resident on the GPU (falls back to eager otherwise).
+WAN22_CUDA_GRAPHS = False
+
+# torch.compile HIGH/LOW diffusion models (mode='reduce-overhead'); compiled once per
+# loaded model and reused by all variants. Takes precedence over WAN22_CUDA_GRAPHS.
+WAN22_TORCH_COMPILE = False
+
+# Default negative prompt
+WAN22_DEFAULT_NEGATIVE_PROMPT = 'vivid colors, overexposed, static, blurry details, subtitles, style, artwork, painting, picture, still, overall gray, worst quality, low quality, JPEG artifacts, ugly, incomplete, extra fingers, poorly drawn hands, poorly drawn face, deformed, disfigured, malformed limbs, fused fingers, static frame, cluttered background, three legs, walking backwards, slow motion, slowmo'
+
+# Variant pipelining: overlap HIGH sampling of variant N+1 with LOW sampling of variant N
+# on separate CUDA streams. Starts only once both models are fully resident in VRAM;
+# ComfyUI model loading is serialized across threads by comfy_bricks.model_loading_lock.
+WAN22_PIPELINE_VARIANTS = False
+
+# Load LOW model (with LoRAs) in background while HIGH sampling runs.
+# Requires enough RAM/VRAM to hold both UNets at the same time.
+WAN22_PREFETCH_LOW_MODEL = False
+
+# Model compute precision ('bf16', 'fp16' or 'fp32') on ComfyUI's compute device (CUDA or XPU);
+# CPU always runs fp32, bf16 falls back to fp16 on devices without bf16 support
+WAN22_DEFAULT_PRECISION = 'bf16'
+WAN22_PRECISION_DTYPES = {
+    'bf16': torch.bfloat16,
+    'fp16': torch.float16,
+    'fp32': torch.float32,
+}
+
+# Progress callback throttling: report only when progress moved by at least
+# PROGRESS_MIN_DELTA percent or PROGRESS_MIN_INTERVAL seconds passed (100% always reported)
+PROGRESS_MIN_DELTA = 1.0
+PROGRESS_MIN_INTERVAL = 0.5
+
+# Progress callbacks run in a background worker that wakes at most this often
+# and sends only the latest value per frame (<= 20 sends/sec)
+PROGRESS_FLUSH_INTERVAL = 0.05
+
 # Initialize logger
 log = setup_logging()
 
+# (frame_id, clip_vision_name, mtime_ns) -> (start_image_tensor, clip_vision_output), CPU tensors
+_clip_vision_cache = OrderedDict()
+
+# Frame PNG encoding and disk writes (zlib and file I/O release the GIL)
+_frame_save_pool = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="wan22_frame_save")
+_frame_save_local = threading.local()
+
+
+def _save_png_frame(image_array: np.ndarray, path: str) -> None:
+    """Write one HxWx3 uint8 frame as PNG, decoding into a reused per-thread RGB image"""
+    size = (image_array.shape[1], image_array.shape[0])
+    scratch_image = getattr(_frame_save_local, 'image', None)
+    if scratch_image is None or scratch_image.size != size:
+        scratch_image = Image.new('RGB', size)
+        _frame_save_local.image = scratch_image
+    scratch_image.frombytes(image_array.data)
+    scratch_image.save(path, compress_level=WAN22_PNG_COMPRESS_LEVEL, optimize=False)
+
+
+def _save_webp_animation(frames_array: np.ndarray, path: str) -> None:
+    """Write the whole NxHxWx3 uint8 sequence as one animated WebP"""
+    animation_frames = [Image.fromarray(image_array) for image_array in frames_array]
+    animation_frames[0].save(
+        path,
+        format='WEBP',
+        save_all=True,
+        append_images=animation_frames[1:],
+        quality=95,
+        lossless=False
+    )
+
+
+# Plugin information (static, built once at import; treat as read-only)
+_PLUGIN_INFO = {
+    'name': 'wan22_i2v',
+    'version': '1.0.0',
+    'description': 'Wan22-I2V video generator for image-to-video generation',
+    'author': 'Kino Team',
+    'visible': True,  # Show in UI
+    'model_type': 'video_diffusion',
+    'parameters': {
+        'prompt': {
+            'type': 'string',
+            'required': True,
+            'description': 'Text prompt for video generation',
+            'example': 'A cat walking in a garden'
+        },
+        'negative_prompt': {
+            'type': 'string',
+            'required': False,
+            'default': WAN22_DEFAULT_NEGATIVE_PROMPT,
+            'description': 'Negative prompt to avoid certain elements',
+            'example': 'blurry, low quality, distorted'
+        },
+        'width': {
+            'type': 'integer',
+            'required': False,
+            'default': 256,
+            'min': 256,
+            'max': 1024,
+            'step': 64,
+            'description': 'Video width in pixels'
+        },
+        'height': {
+            'type': 'integer',
+            'required': False,
+            'default': 256,
+            'min': 256,
+            'max': 1024,
+            'step': 64,
+            'description': 'Video height in pixels'
+        },
+        'num_frames': {
+            'type': 'integer',
+            'required': False,
+            'default': 17,
+            'min': 5,
+            'max': 121,
+            'step': 4,
+            'description': 'Number of frames (must be 1 + X * 4, e.g., 5, 9, 13, 17, 21, ..., 81, ..., 121)',
+            'validation': 'value must satisfy: (value - 1) % 4 == 0'
+        },
+        'seed': {
+            'type': 'integer',
+            'required': False,
+            'description': 'Random seed (leave empty for random)',
+            'example': 12345
+        },
+        'high_loras': {
+            'type': 'lora_list',
+            'required': False,
+            'description': 'LoRAs applied to HIGH noise model',
+            'item_schema': {
+                'lora_name': {
+                    'type': 'string',
+                    'description': 'LoRA filename (must be in models_storage/Lora/ folder)'
+                },
+                'strength_model': {
+                    'type': 'float',
+                    'default': 1.0,
+                    'min': 0.0,
+                    'max': 2.0,
+                    'description': 'LoRA strength for model'
+                }
+            }
+        },
+        'low_loras': {
+            'type': 'lora_list',
+            'required': False,
+            'description': 'LoRAs applied to LOW noise model',
+            'item_schema': {
+                'lora_name': {
+                    'type': 'string',
+                    'description': 'LoRA filename (must be in models_storage/Lora/ folder)'
+                },
+                'strength_model': {
+                    'type': 'float',
+                    'default': 1.0,
+                    'min': 0.0,
+                    'max': 2.0,
+                    'description': 'LoRA strength for model'
+                }
+            }
+        },
+        'num_variants': {
+            'type': 'integer',
+            'required': False,
+            'default': 1,
+            'min': 1,
+            'max': 5,
+            'description': 'Number of variants to generate'
+        },
+        'precision': {
+            'type': 'selection',
+            'required': False,
+            'default': WAN22_DEFAULT_PRECISION,
+            'options': list(WAN22_PRECISION_DTYPES),
+            'description': 'Model compute precision (fp32 is used on CPU)'
+        }
+    }
+}
+
 
 class PluginResult:
     """Result of plugin execution"""
@@ -65,6 +266,25 @@ class Wan22I2VLoader:
         self.current_frame_id = None
         self.db = None
         self.frame_service = None
+        # Variant pipelining state (see WAN22_PIPELINE_VARIANTS)
+        self.stream_a = None  # HIGH sampling stream
+        self.stream_b = None  # LOW sampling + VAE decode stream
+        self._models = {}  # stage -> model with LoRAs, kept resident across variants of a task
+        self._model_loads = {}  # stage -> executor future of a model load in progress
+        self._model_dtype = None  # Compute dtype for HIGH/LOW models, resolved per task
+        self._message_base = {}  # Task-level fields shared by all variant WebSocket messages
+        self._pending_high = None  # Future with HIGH sampling of the next variant
+        self._blank_preview_bytes = None  # Encoded blank preview PNG shared by all variants
+        self._last_reported_progress = 0.0
+        self._last_reported_at = 0.0
+        self._progress_queue = None  # (frame_id, callback, progress); None stops the worker
+        self._progress_worker_task = None
+        # WebSocket notifications of all variants are batched into few messages
+        from handlers.websocket import PendingBroadcast
+        self._pending_broadcast = PendingBroadcast()
+        # Params sidecars are written off the generation path
+        from bricks.generation_params import GenerationParamsWriter
+        self._params_writer = GenerationParamsWriter()
 
     async def generate(
         self,
@@ -86,6 +306,7 @@ class Wan22I2VLoader:
         - low_loras: list (optional) - List of LoRA configurations for LOW model with lora_name, strength_model
         - project_id: int (optional) - Project ID (automatically added by frontend)
         - num_variants: int (optional, default: 1) - Number of variants to generate
+        - precision: str (optional, default: 'bf16') - Model compute precision: bf16, fp16 or fp32
         """
         try:
             self.is_running = True
@@ -102,7 +323,6 @@ class Wan22I2VLoader:
             num_variants = parameters.get('num_variants', 1)  # Default to 1 variant
             base_seed = parameters.get('seed', None)  # Base seed for variants
 
-
             # Validate required parameters before initializing DB
             if not prompt:
                 return PluginResult(
@@ -119,11 +339,29 @@ class Wan22I2VLoader:
                     error="Parameter 'num_variants' must be an integer between 1 and 5"
                 )
 
-            negative_prompt = parameters.get('negative_prompt', '')
+            negative_prompt = parameters.get('negative_prompt', WAN22_DEFAULT_NEGATIVE_PROMPT)
             width = parameters.get('width', 256)
             height = parameters.get('height', 256)
+            num_frames = parameters.get('num_frames', 17)
             project_id = data.get('project_id', None)
 
+            # Validate num_frames: must be 1 + X * 4
+            if (num_frames - 1) % 4 != 0:
+                log.warning("wan22_i2v_invalid_num_frames", {
+                    "num_frames": num_frames,
+                    "corrected_to": 17
+                })
+                num_frames = 17  # Default to 17 if invalid
+
+            precision = parameters.get('precision', WAN22_DEFAULT_PRECISION)
+            if precision not in WAN22_PRECISION_DTYPES:
+                return PluginResult(
+                    success=False,
+                    data={},
+                    error=f"Parameter 'precision' must be one of: {', '.join(WAN22_PRECISION_DTYPES)}"
+                )
+            self._model_dtype = self._resolve_model_dtype(precision)
+
             # Initialize frame service for preview updates using global DB
             self.db = get_db()
             self.frame_service = FrameService(self.db)
@@ -132,9 +370,41 @@ class Wan22I2VLoader:
             if self.should_stop:
                 return PluginResult(success=False, data={}, error="Generation stopped")
 
+            # Resolve base seed once so every variant seed is known up front (needed for pipelining)
+            if base_seed is None:
+                base_seed = random.randint(0, 2**32 - 1)
+
+            if self._pipeline_enabled():
+                self.stream_a = torch.cuda.Stream()
+                self.stream_b = torch.cuda.Stream()
+
             # Step 1: Initialize progress (10%)
             await self.update_progress(10.0, progress_callback)
 
+            # Previous frame does not change between variants: encode it once per task
+            start_image_tensor, clip_vision_output = await self._encode_previous_frame(project_id)
+
+            # VAE, text conditioning and empty video latent are identical for all variants,
+            # only the sampler seed differs: prepare them once per task
+            conditioning = self._prepare_conditioning(
+                prompt, negative_prompt, width, height, num_frames, start_image_tensor, clip_vision_output
+            )
+
+            # All variants have the same size: encode blank preview PNG once
+            self._blank_preview_bytes = self._encode_blank_preview(width, height)
+
+            # Create frame records for all variants at once: (frame_id, preview_path) per variant
+            variant_frames = None
+            if not regenerate_frame_id:
+                variant_frames = await self._create_variant_frames(project_id, num_variants, width, height)
+
+            # Fields shared by every variant's generation_started/completed message
+            self._message_base = {
+                'task_id': data.get('task_id', 0),
+                'project_id': project_id,
+                'generator': 'wan22_i2v'
+            }
+
             # Generate multiple variants
             generated_frames = []
             base_frame_id = None  # Will be set by first variant
@@ -153,7 +423,14 @@ class Wan22I2VLoader:
                     base_seed=base_seed,
                     data=data,
                     base_frame_id=base_frame_id,
-                    progress_callback=lambda p: progress_callback(min(100.0, variant_progress_start + p * (variant_progress_end - variant_progress_start) / 100.0)) if progress_callback else None
+                    variant_frame=variant_frames[variant_idx] if variant_frames else None,
+                    conditioning=conditioning,
+                    # Bind this variant's range now: the progress worker runs the callback later,
+                    # possibly after the loop has moved on to the next variant
+                    progress_callback=(
+                        lambda p, start=variant_progress_start, end=variant_progress_end:
+                            progress_callback(min(100.0, start + p * (end - start) / 100.0))
+                    ) if progress_callback else None
                 )
 
                 if not variant_result['success']:
@@ -201,12 +478,20 @@ class Wan22I2VLoader:
                 error=f"Wan22-I2V generation error: {str(e)}"
             )
 
+        finally:
+            await self._release_pipeline()
+            await self._flush_progress()
+            await self._pending_broadcast.flush()
+            await self._params_writer.flush()
+
     async def _generate_single_variant(
         self,
         variant_idx: int,
-        base_seed: Optional[int],
+        base_seed: int,
         data: Dict[str, Any],
         base_frame_id: Optional[int] = None,
+        variant_frame: Optional[tuple] = None,
+        conditioning: Optional[Dict[str, Any]] = None,
         progress_callback: Optional[Callable[[float], None]] = None
     ) -> Dict[str, Any]:
         """Generate a single variant of the video"""
@@ -214,18 +499,10 @@ class Wan22I2VLoader:
             # Extract parameters from data.parameters
             parameters = data.get('parameters', {})
             prompt = parameters.get('prompt')
-            negative_prompt = parameters.get('negative_prompt', 'vivid colors, overexposed, static, blurry details, subtitles, style, artwork, painting, picture, still, overall gray, worst quality, low quality, JPEG artifacts, ugly, incomplete, extra fingers, poorly drawn hands, poorly drawn face, deformed, disfigured, malformed limbs, fused fingers, static frame, cluttered background, three legs, walking backwards, slow motion, slowmo')
+            negative_prompt = parameters.get('negative_prompt', WAN22_DEFAULT_NEGATIVE_PROMPT)
             width = parameters.get('width', 256)
             height = parameters.get('height', 256)
-            num_frames = parameters.get('num_frames', 17)
-
-            # Validate num_frames: must be 1 + X * 4
-            if (num_frames - 1) % 4 != 0:
-                log.warning("wan22_i2v_invalid_num_frames", {
-                    "num_frames": num_frames,
-                    "corrected_to": 17
-                })
-                num_frames = 17  # Default to 17 if invalid
+            num_frames = conditioning['num_frames']  # Validated in generate()
 
 
             project_id = data.get('project_id', None)
@@ -233,13 +510,10 @@ class Wan22I2VLoader:
             task_id = data.get('task_id', 0)
             high_loras = parameters.get('high_loras', [])  # LoRAs for HIGH noise model
             low_loras = parameters.get('low_loras', [])  # LoRAs for LOW noise model
+            has_next_variant = variant_idx + 1 < parameters.get('num_variants', 1)
 
             # Calculate seed for this variant
-            if base_seed is not None:
-                current_seed = base_seed + variant_idx
-            else:
-                import random
-                current_seed = random.randint(0, 2**32 - 1) + variant_idx
+            current_seed = base_seed + variant_idx
 
             log.info("wan22_i2v_variant_start", {
                 "variant_idx": variant_idx,
@@ -250,55 +524,16 @@ class Wan22I2VLoader:
             if self.should_stop:
                 return {'success': False, 'error': 'Generation stopped'}
 
-            # Step 2: Create frame record first to get frame_id for naming (20%)
+            # Step 2: Resolve frame record and preview path for this variant (20%)
             await self.update_progress(20.0, progress_callback)
 
             # Set up paths for generation
             if not regenerate_frame_id:
-                # New generation: create frame record first to get frame_id
-                from models.frame import FrameCreate
-
-                if base_frame_id is None:
-                    # First variant: create new frame and get frame_id
-                    temp_path = f"temp_frame_{project_id}_{variant_idx}.mp4"
-
-                    frame_create = FrameCreate(
-                        path=temp_path,  # Temporary path
-                        generator='wan22_i2v',
-                        project_id=project_id,
-                        variant_id=variant_idx
-                    )
-
-                    created_frame = await self.frame_service.create_frame(frame_create)
-                    frame_id = created_frame.id
-                else:
-                    # Subsequent variants: reuse base_frame_id but create new record
-                    temp_path = f"temp_frame_{project_id}_{variant_idx}.mp4"
-
-                    frame_create = FrameCreate(
-                        path=temp_path,  # Temporary path
-                        generator='wan22_i2v',
-                        project_id=project_id,
-                        variant_id=variant_idx
-                    )
-
-                    created_frame = await self.frame_service.create_frame(frame_create)
-                    frame_id = created_frame.id
-
+                # New generation: frame record, path and blank preview were created up front
+                # for all variants by generate()
+                frame_id, self.preview_path = variant_frame
                 # Use base_frame_id for naming (or frame_id if it's the first variant)
                 naming_frame_id = base_frame_id if base_frame_id is not None else frame_id
-                # Preview will be the first frame of the sequence (seq_000.png)
-                preview_filename = f"project_{project_id}_frame_{naming_frame_id}_variant_{variant_idx}_seq_000.png"
-                frames_dir = Path(Config.FRAMES_DIR)
-                frames_dir.mkdir(parents=True, exist_ok=True)
-
-                self.preview_path = str(frames_dir / preview_filename)
-
-                # Update frame path with correct path
-                from models.frame import FrameUpdate
-                await self.frame_service.update_frame(frame_id, FrameUpdate(
-                    path=self.preview_path
-                ))
             else:
                 # Regeneration: use existing frame's path (should be seq_000.png)
                 existing_frame = await self.frame_service.get_frame_by_id(regenerate_frame_id)
@@ -306,13 +541,8 @@ class Wan22I2VLoader:
                 frame_id = regenerate_frame_id
                 naming_frame_id = frame_id
 
-            # Create initial preview (blank image)
-            try:
-                blank_img = Image.new('RGB', (width, height), color=(32, 32, 32))
-                blank_img.save(self.preview_path)
-                log.info("wan22_i2v_blank_preview_created", {"path": self.preview_path})
-            except Exception as e:
-                log.warning("wan22_i2v_preview_error", {"error": str(e)})
+                # Reset preview to a blank image
+                self._write_blank_preview(self.preview_path)
 
             # Set current frame ID for logging and WebSocket
             self.current_frame_id = frame_id
@@ -322,15 +552,12 @@ class Wan22I2VLoader:
             })
 
             # Broadcast "generation started" message with preview path
-            from handlers.websocket import broadcast_message
-            await broadcast_message({
+            self._broadcast_nowait({
                 'type': 'generation_started',
                 'data': {
-                    'task_id': task_id,
+                    **self._message_base,
                     'frame_id': self.current_frame_id,
-                    'project_id': project_id,
                     'preview_path': self.preview_path,
-                    'generator': 'wan22_i2v',
                     'variant_id': variant_idx
                 }
             })
@@ -339,235 +566,88 @@ class Wan22I2VLoader:
             await self.update_progress(30.0, progress_callback)
 
             try:
-                # 1. Load CLIP Vision
-                await self.update_progress(35.0, progress_callback)
-                clip_vision = wan_bricks.load_clip_vision("clip_vision_h.safetensors")
-                log.info("wan22_i2v_clip_vision_loaded", {"clip_vision_name": "clip_vision_h.safetensors"})
-
-                # 2. Get previous frame and encode with CLIP Vision
-                await self.update_progress(40.0, progress_callback)
-
-                if project_id:
-                    previous_frame = None
-                    clip_vision_output = None
-                    start_image = None
-
-                    project_frames = await self.frame_service.get_frames_by_project(project_id)
-                    if project_frames:
-                        sorted_frames = sorted(project_frames, key=lambda f: f.id)
-                        previous_frame = sorted_frames[-1]
-
-                        # Load previous frame image
-                        if previous_frame.path and os.path.exists(previous_frame.path):
-                            start_image = Image.open(previous_frame.path)
-                            # Convert PIL Image to ComfyUI format (tensor)
-                            start_image_array = np.array(start_image).astype(np.float32) / 255.0
-                            start_image_tensor = torch.from_numpy(start_image_array).unsqueeze(0)  # Add batch dimension
-
-                            # Encode with CLIP Vision
-                            clip_vision_output = wan_bricks.clip_vision_encode(clip_vision, start_image_tensor)
-                            log.info("wan22_i2v_previous_frame_encoded", {
-                                "frame_id": previous_frame.id,
-                                "frame_path": previous_frame.path
-                            })
-                        else:
-                            log.warning("wan22_i2v_previous_frame_not_found", {"path": previous_frame.path})
-                    else:
-                        log.warning("wan22_i2v_no_previous_frame", {"project_id": project_id})
-                else:
-                    previous_frame = None
-                    clip_vision_output = None
-                    start_image = None
-
-                # 3. Load VAE wan_2.1
-                await self.update_progress(45.0, progress_callback)
-                vae = wan_bricks.load_vae(VAE_WAN_2_1_MODEL)
-                log.info("wan22_i2v_vae_loaded", {"vae_name": VAE_WAN_2_1_MODEL})
-
-                # 4. Load Text Encoder (GGUF)
-                await self.update_progress(50.0, progress_callback)
-                text_encoder = wan_bricks.load_clip(TEXT_ENCODER_MODEL, clip_type="wan")
-                log.info("wan22_i2v_text_encoder_loaded", {"text_encoder_name": TEXT_ENCODER_MODEL})
-
-                # 5. Text Encoding for Positive and Negative
-                await self.update_progress(55.0, progress_callback)
-                positive = comfy_bricks.clip_encode(text_encoder, prompt)
-                negative = comfy_bricks.clip_encode(text_encoder, negative_prompt)
-                log.info("wan22_i2v_text_encoded", {
-                    "prompt": prompt[:50] + "..." if len(prompt) > 50 else prompt,
-                    "negative_prompt": negative_prompt[:50] + "..." if len(negative_prompt) > 50 else negative_prompt
-                })
-
-                # 6. WanImageToVideo
-                await self.update_progress(60.0, progress_callback)
-                positive, negative, latent_video = wan_bricks.wan_image_to_video(
-                    positive=positive,
-                    negative=negative,
-                    vae=vae,
-                    width=width,
-                    height=height,
-                    length=num_frames,  # User-configurable number of frames
-                    batch_size=1,
-                    clip_vision_output=clip_vision_output,
-                    start_image=start_image_tensor if start_image is not None else None
-                )
-                log.info("wan22_i2v_latent_video_created", {
-                    "width": width,
-                    "height": height,
-                    "length": num_frames
-                })
+                # 1-6. CLIP Vision, VAE, text encoding and WanImageToVideo are prepared
+                # once per task in generate()
+                vae = conditioning['vae']
+                positive = conditioning['positive']
+                negative = conditioning['negative']
+                latent_video = conditioning['latent_video']
 
                 # 7. Load HIGH model and First KSampler (Advanced)
                 await self.update_progress(70.0, progress_callback)
 
-                # Load HIGH model just before using it (saves memory)
-                high_model = gguf_bricks.load_unet_gguf(WAN22_HIGH_NOISE_MODEL)
-                log.info("wan22_i2v_high_model_loaded", {"model": WAN22_HIGH_NOISE_MODEL})
-
-                # Apply ModelSamplingSD3 with shift = 8 for HIGH model
-                high_model = comfy_bricks.model_sampling_sd3(high_model, shift=8)
-                log.info("wan22_i2v_high_model_sampling_applied", {"shift": 8})
-
-                # Load and apply LoRA for HIGH model
-                # Apply FusionX LoRA
-                if os.path.exists(os.path.join(Config.MODELS_DIR, "SysLora", SYS_LORA_WAN_2_1_FUSION_X)):
-                    high_model = comfy_bricks.load_lora_model_only(
-                        os.path.join(Config.MODELS_DIR, "SysLora", SYS_LORA_WAN_2_1_FUSION_X),
-                        high_model,
-                        strength_model=1.0
+                # Prefetch LOW model in a worker thread so its load overlaps HIGH load and sampling.
+                # run_in_executor submits right away; HIGH sampling blocks the loop thread.
+                low_prefetched = False
+                if WAN22_PREFETCH_LOW_MODEL and 'low' not in self._models:
+                    self._start_model_load(
+                        'low', WAN22_LOW_NOISE_MODEL, SYS_LORA_WAN_2_2_LIGHTNING_I2V_LOW, low_loras
                     )
-                    log.info("wan22_i2v_high_fusionx_lora_applied", {"lora": SYS_LORA_WAN_2_1_FUSION_X})
+                    low_prefetched = True
+
+                high_done = None  # CUDA event recorded when pipelined HIGH sampling finishes
+                if self._pending_high is not None:
+                    # HIGH sampling for this variant was started while the previous one ran LOW
+                    pending_high, self._pending_high = self._pending_high, None
+                    high_latent_video, high_done = await pending_high
+                    high_model = self._models['high']
+                    log.info("wan22_i2v_high_sampling_pipelined", {"seed": current_seed})
                 else:
-                    log.warning("wan22_i2v_high_fusionx_lora_not_found", {"path": os.path.join(Config.MODELS_DIR, "SysLora", SYS_LORA_WAN_2_1_FUSION_X)})
+                    # Load HIGH model on first use; following variants reuse it
+                    high_model = await self._get_noise_model(
+                        'high', WAN22_HIGH_NOISE_MODEL, SYS_LORA_WAN_2_2_LIGHTNING_I2V_HIGH, high_loras
+                    )
+
+                    await self.update_progress(75.0, progress_callback)
+                    high_latent_video = self._sample_high(high_model, latent_video, positive, negative, current_seed)
+                    log.info("wan22_i2v_high_sampling_completed")
 
-                # Apply Lightning I2V HIGH LoRA
-                if os.path.exists(os.path.join(Config.MODELS_DIR, "SysLora", SYS_LORA_WAN_2_2_LIGHTNING_I2V_HIGH)):
-                    high_model = comfy_bricks.load_lora_model_only(
-                        os.path.join(Config.MODELS_DIR, "SysLora", SYS_LORA_WAN_2_2_LIGHTNING_I2V_HIGH),
+                # Start HIGH sampling of the next variant so it overlaps LOW sampling of this one.
+                # Conditioning and latent are shared between variants, only the seed differs.
+                if has_next_variant and self.stream_a is not None and self._models_resident():
+                    self._pending_high = asyncio.get_running_loop().run_in_executor(
+                        None,
+                        self._sample_high_pipelined,
                         high_model,
-                        strength_model=1.0
+                        latent_video,
+                        positive,
+                        negative,
+                        current_seed + 1
                     )
-                    log.info("wan22_i2v_high_lightning_lora_applied", {"lora": SYS_LORA_WAN_2_2_LIGHTNING_I2V_HIGH})
-                else:
-                    log.warning("wan22_i2v_high_lightning_lora_not_found", {"path": os.path.join(Config.MODELS_DIR, "SysLora", SYS_LORA_WAN_2_2_LIGHTNING_I2V_HIGH)})
-
-                # Apply user-specified HIGH LoRAs
-                if high_loras and len(high_loras) > 0:
-                    for lora_config in high_loras:
-                        lora_name = lora_config.get('lora_name')
-                        if not lora_name:
-                            continue
-
-                        strength_model = lora_config.get('strength_model', 1.0)
-
-                        if not os.path.exists(os.path.join(Config.MODELS_DIR, "Lora", lora_name)):
-                            log.warning("wan22_i2v_high_user_lora_not_found", {"lora_path": os.path.join(Config.MODELS_DIR, "Lora", lora_name)})
-                            continue
-
-                        high_model = comfy_bricks.load_lora_model_only(
-                            os.path.join(Config.MODELS_DIR, "Lora", lora_name),
-                            high_model,
-                            strength_model=strength_model
-                        )
-                        log.info("wan22_i2v_high_user_lora_applied", {
-                            "lora_name": lora_name,
-                            "strength_model": strength_model
-                        })
-
-                await self.update_progress(75.0, progress_callback)
-                high_latent_video, _ = comfy_bricks.common_ksampler(
-                    model=high_model,  # Use loaded HIGH GGUF model
-                    latent=latent_video,
-                    positive=positive,
-                    negative=negative,
-                    steps=WAN22_STEPS,
-                    cfg=WAN22_CFG_SCALE,
-                    sampler_name='dpmpp_2m_sde',
-                    scheduler='sgm_uniform',
-                    seed=current_seed,
-                    start_step=0,
-                    last_step=WAN22_SPLIT,
-                    disable_noise=False
-                )
-                log.info("wan22_i2v_high_sampling_completed")
 
                 # 8. Load LOW model and Second KSampler (Advanced)
                 await self.update_progress(80.0, progress_callback)
 
-                # Load LOW model just before using it (saves memory)
-                low_model = gguf_bricks.load_unet_gguf(WAN22_LOW_NOISE_MODEL)
-                log.info("wan22_i2v_low_model_loaded", {"model": WAN22_LOW_NOISE_MODEL})
-
-                # Apply ModelSamplingSD3 with shift = 8 for LOW model
-                low_model = comfy_bricks.model_sampling_sd3(low_model, shift=8)
-                log.info("wan22_i2v_low_model_sampling_applied", {"shift": 8})
-
-                # Load and apply LoRA for LOW model
-                # Apply FusionX LoRA
-                if os.path.exists(os.path.join(Config.MODELS_DIR, "SysLora", SYS_LORA_WAN_2_1_FUSION_X)):
-                    low_model = comfy_bricks.load_lora_model_only(
-                        os.path.join(Config.MODELS_DIR, "SysLora", SYS_LORA_WAN_2_1_FUSION_X),
-                        low_model,
-                        strength_model=1.0
-                    )
-                    log.info("wan22_i2v_low_fusionx_lora_applied", {"lora": SYS_LORA_WAN_2_1_FUSION_X})
-                else:
-                    log.warning("wan22_i2v_low_fusionx_lora_not_found", {"path": os.path.join(Config.MODELS_DIR, "SysLora", SYS_LORA_WAN_2_1_FUSION_X)})
-
-                # Apply Lightning I2V LOW LoRA
-                if os.path.exists(os.path.join(Config.MODELS_DIR, "SysLora", SYS_LORA_WAN_2_2_LIGHTNING_I2V_LOW)):
-                    low_model = comfy_bricks.load_lora_model_only(
-                        os.path.join(Config.MODELS_DIR, "SysLora", SYS_LORA_WAN_2_2_LIGHTNING_I2V_LOW),
-                        low_model,
-                        strength_model=1.0
-                    )
-                    log.info("wan22_i2v_low_lightning_lora_applied", {"lora": SYS_LORA_WAN_2_2_LIGHTNING_I2V_LOW})
-                else:
-                    log.warning("wan22_i2v_low_lightning_lora_not_found", {"path": os.path.join(Config.MODELS_DIR, "SysLora", SYS_LORA_WAN_2_2_LIGHTNING_I2V_LOW)})
-
-                # Apply user-specified LOW LoRAs
-                if low_loras and len(low_loras) > 0:
-                    for lora_config in low_loras:
-                        lora_name = lora_config.get('lora_name')
-                        if not lora_name:
-                            continue
-
-                        strength_model = lora_config.get('strength_model', 1.0)
-
-                        if not os.path.exists(os.path.join(Config.MODELS_DIR, "Lora", lora_name)):
-                            log.warning("wan22_i2v_low_user_lora_not_found", {"lora_path": os.path.join(Config.MODELS_DIR, "Lora", lora_name)})
-                            continue
-
-                        low_model = comfy_bricks.load_lora_model_only(
-                            os.path.join(Config.MODELS_DIR, "Lora", lora_name),
-                            low_model,
-                            strength_model=strength_model
-                        )
-                        log.info("wan22_i2v_low_user_lora_applied", {
-                            "lora_name": lora_name,
-                            "strength_model": strength_model
-                        })
+                # Load LOW model on first use (or finish the prefetch); following variants reuse it
+                low_model = await self._get_noise_model(
+                    'low', WAN22_LOW_NOISE_MODEL, SYS_LORA_WAN_2_2_LIGHTNING_I2V_LOW, low_loras
+                )
+                if low_prefetched:
+                    log.info("wan22_i2v_low_model_prefetched", {"model": WAN22_LOW_NOISE_MODEL})
 
                 await self.update_progress(85.0, progress_callback)
-                low_latent_video, _ = comfy_bricks.common_ksampler(
-                    model=low_model,  # Use loaded LOW GGUF model
-                    latent=high_latent_video,
-                    positive=positive,
-                    negative=negative,
-                    steps=WAN22_STEPS,
-                    cfg=WAN22_CFG_SCALE,
-                    sampler_name='dpmpp_2m_sde',
-                    scheduler='sgm_uniform',
-                    seed=current_seed,
-                    start_step=WAN22_SPLIT,
-                    last_step=10000,
-                    disable_noise=True
-                )
+                if self.stream_b is not None:
+                    # Run LOW on its own stream so it overlaps the next variant's HIGH sampling
+                    if high_done is not None:
+                        self.stream_b.wait_event(high_done)
+                        # Samples come back on ComfyUI's intermediate device (CPU by default)
+                        if high_latent_video['samples'].is_cuda:
+                            high_latent_video['samples'].record_stream(self.stream_b)
+                    with torch.cuda.stream(self.stream_b):
+                        low_latent_video = self._sample_low(low_model, high_latent_video, positive, negative, current_seed)
+                else:
+                    low_latent_video = self._sample_low(low_model, high_latent_video, positive, negative, current_seed)
                 log.info("wan22_i2v_low_sampling_completed")
 
                 # 9. VAE Decode
                 await self.update_progress(90.0, progress_callback)
-                images = comfy_bricks.vae_decode(vae, low_latent_video)
+                if self.stream_b is not None:
+                    # Stay off the default stream, it would serialize with the next HIGH sampling
+                    with torch.cuda.stream(self.stream_b):
+                        images = comfy_bricks.vae_decode(vae, low_latent_video)
+                    self.stream_b.synchronize()
+                else:
+                    images = comfy_bricks.vae_decode(vae, low_latent_video)
                 log.info("wan22_i2v_vae_decode_completed", {"frames_count": len(images)})
 
                 # Save video frames as sequence
@@ -575,50 +655,61 @@ class Wan22I2VLoader:
 
                 # Convert images batch to list of PIL Images
                 saved_paths = []
+                webp_animated = WAN22_OUTPUT_FORMAT == 'webp_animated'
                 frames_dir = Path(Config.FRAMES_DIR)
                 frames_dir.mkdir(parents=True, exist_ok=True)
 
-                # Use naming_frame_id for consistency with variants
-                naming_frame_id = base_frame_id if base_frame_id is not None else frame_id
-
-                for seq_idx, image in enumerate(images):
-                    try:
-                        # Convert tensor to numpy array
-                        if hasattr(image, 'cpu'):
-                            image_array = image.cpu().detach().numpy()
-                        else:
-                            image_array = image.detach().numpy()
-
-                        # Convert to PIL Image
-                        image_array = (image_array * 255).astype(np.uint8)
+                # Sequence paths only differ by index: project_ID_frame_ID_variant_ID_seq_###.png
+                # (naming_frame_id was resolved in step 2 for consistency with variants)
+                seq_path_prefix = f"{frames_dir}{os.sep}project_{project_id}_frame_{naming_frame_id}_variant_{variant_idx}_seq_"
 
-                        # Remove batch dimension if present
-                        if len(image_array.shape) == 4:
-                            image_array = image_array[0]
-
-                        # Convert from CHW to HWC format if needed
-                        if image_array.shape[0] == 3:
-                            image_array = np.transpose(image_array, (1, 2, 0))
-
-                        pil_image = Image.fromarray(image_array)
-
-                        # Save with sequence number: project_ID_frame_ID_variant_ID_seq_###.png
-                        seq_filename = f"project_{project_id}_frame_{naming_frame_id}_variant_{variant_idx}_seq_{seq_idx:03d}.png"
-                        seq_path = str(frames_dir / seq_filename)
-                        pil_image.save(seq_path)
-                        saved_paths.append(seq_path)
-
-                        log.debug("wan22_i2v_frame_saved", {
-                            "seq_idx": seq_idx,
-                            "path": seq_path
-                        })
-
-                    except Exception as e:
+                # Convert the whole batch once: scale and cast before a single copy to CPU
+                if isinstance(images, torch.Tensor):
+                    frames_array = images.detach().mul(255).clamp_(0, 255).to(torch.uint8).cpu().numpy()
+                else:
+                    frames_array = (np.asarray([image.detach().numpy() for image in images]) * 255).astype(np.uint8)
+
+                # Convert from NCHW to NHWC format if needed
+                if frames_array.shape[1] == 3 and frames_array.shape[-1] != 3:
+                    frames_array = np.ascontiguousarray(frames_array.transpose(0, 2, 3, 1))
+
+                # Frames are encoded and written concurrently in the frame save pool, off the event loop.
+                # With 'webp_animated' only the first frame is written as PNG (thumbnail).
+                png_count = 1 if webp_animated else len(frames_array)
+                seq_paths = [seq_path_prefix + f"{seq_idx:03d}.png" for seq_idx in range(png_count)]
+                loop = asyncio.get_running_loop()
+                results = await asyncio.gather(*[
+                    loop.run_in_executor(_frame_save_pool, _save_png_frame, frames_array[seq_idx], seq_path)
+                    for seq_idx, seq_path in enumerate(seq_paths)
+                ], return_exceptions=True)
+
+                for seq_idx, (seq_path, result) in enumerate(zip(seq_paths, results)):
+                    if isinstance(result, Exception):
                         log.error("wan22_i2v_frame_save_error", {
                             "seq_idx": seq_idx,
-                            "error": str(e)
+                            "error": str(result)
                         })
                         continue
+                    saved_paths.append(seq_path)
+                    log.debug("wan22_i2v_frame_saved", {
+                        "seq_idx": seq_idx,
+                        "path": seq_path
+                    })
+
+                saved_frames_count = len(saved_paths)
+                if webp_animated and saved_paths:
+                    # Whole sequence as one file instead of one PNG per frame
+                    animation_filename = f"project_{project_id}_frame_{naming_frame_id}_variant_{variant_idx}.webp"
+                    animation_path = str(frames_dir / animation_filename)
+                    try:
+                        await loop.run_in_executor(_frame_save_pool, _save_webp_animation, frames_array, animation_path)
+                        saved_frames_count = len(frames_array)
+                        log.info("wan22_i2v_animation_saved", {
+                            "path": animation_path,
+                            "frames_count": saved_frames_count
+                        })
+                    except Exception as e:
+                        log.error("wan22_i2v_animation_save_error", {"error": str(e)})
 
                 # Update progress after saving all frames
                 await self.update_progress(95.0, progress_callback)
@@ -639,12 +730,12 @@ class Wan22I2VLoader:
             except Exception as e:
                 return {'success': False, 'error': f'Failed to generate video: {str(e)}'}
 
-            # Step 4: Save generation parameters (95% -> 98%)
+            # Step 4: Queue generation parameters for background write (95% -> 98%)
             await self.update_progress(96.0, progress_callback)
             try:
-                from bricks.generation_params import save_generation_params
-                await save_generation_params(
-                    output_path=output_path_str,  # Save params with first frame path
+                from bricks.generation_params import build_generation_params, get_params_path
+                generation_data = build_generation_params(
+                    img_path=output_path_str,  # Save params with first frame path
                     plugin_name='wan22_i2v',
                     plugin_version='1.0.0',
                     task_id=task_id,
@@ -658,12 +749,13 @@ class Wan22I2VLoader:
                         'seed': current_seed,
                         'model_name': WAN22_HIGH_NOISE_MODEL,  # Keep for reference but not user-configurable
                         'num_variants': data.get('num_variants', 1),
-                        'total_frames': len(saved_paths),  # Actual number of saved frames
+                        'total_frames': saved_frames_count,  # Actual number of saved frames
                         'high_loras': high_loras,  # User-specified LoRAs for HIGH model
                         'low_loras': low_loras  # User-specified LoRAs for LOW model
                     },
                     project_id=project_id
                 )
+                self._params_writer.put(get_params_path(output_path_str), generation_data)
 
             except Exception as e:
                 log.warning("wan22_i2v_params_save_error", {"error": str(e)})
@@ -672,15 +764,12 @@ class Wan22I2VLoader:
             await self.update_progress(100.0, progress_callback)
 
             # Broadcast "generation completed" message
-            from handlers.websocket import broadcast_message
-            await broadcast_message({
+            self._broadcast_nowait({
                 'type': 'generation_completed',
                 'data': {
-                    'task_id': task_id,
+                    **self._message_base,
                     'frame_id': self.current_frame_id,
-                    'project_id': project_id,
                     'final_path': output_path_str,
-                    'generator': 'wan22_i2v',
                     'variant_id': variant_idx
                 }
             })
@@ -703,126 +792,413 @@ class Wan22I2VLoader:
             log.error("wan22_i2v_variant_error", {"error": str(e), "variant_idx": variant_idx})
             return {'success': False, 'error': f'Variant generation error: {str(e)}'}
 
+    async def _encode_previous_frame(self, project_id: Optional[int]):
+        """
+        Load the last frame of the project and encode it with CLIP Vision.
+
+        Cached per (frame id, CLIP Vision model, file mtime) so variants and follow-up
+        tasks skip the CLIP Vision load and encode. Returns (start_image_tensor, clip_vision_output).
+        """
+        if not project_id:
+            return None, None
+
+        project_frames = await self.frame_service.get_frames_by_project(project_id)
+        if not project_frames:
+            log.warning("wan22_i2v_no_previous_frame", {"project_id": project_id})
+            return None, None
+
+        previous_frame = max(project_frames, key=lambda f: f.id)
+        if not previous_frame.path or not os.path.exists(previous_frame.path):
+            log.warning("wan22_i2v_previous_frame_not_found", {"path": previous_frame.path})
+            return None, None
+
+        cache_key = (previous_frame.id, CLIP_VISION_MODEL, os.stat(previous_frame.path).st_mtime_ns)
+        cached = _clip_vision_cache.get(cache_key)
+        if cached is not None:
+            _clip_vision_cache.move_to_end(cache_key)
+            log.info("wan22_i2v_previous_frame_cache_hit", {"frame_id": previous_frame.id})
+            return cached
+
+        clip_vision = wan_bricks.load_clip_vision(CLIP_VISION_MODEL)
+        log.info("wan22_i2v_clip_vision_loaded", {"clip_vision_name": CLIP_VISION_MODEL})
+
+        # Convert PIL Image to ComfyUI format (tensor), uint8 -> device then float
+        with Image.open(previous_frame.path) as start_image:
+            start_image_tensor = wan_bricks.pil_to_image_tensor(start_image)
+
+        clip_vision_output = wan_bricks.clip_vision_encode(clip_vision, start_image_tensor)
+        log.info("wan22_i2v_previous_frame_encoded", {
+            "frame_id": previous_frame.id,
+            "frame_path": previous_frame.path
+        })
+
+        # Cache CPU copies: entries outlive the task and must not compete with the UNet for VRAM
+        _clip_vision_cache[cache_key] = (
+            start_image_tensor.cpu(),
+            wan_bricks.clip_vision_output_to_cpu(clip_vision_output)
+        )
+        if len(_clip_vision_cache) > CLIP_VISION_CACHE_SIZE:
+            _clip_vision_cache.popitem(last=False)
+
+        return start_image_tensor, clip_vision_output
+
+    async def _create_variant_frames(self, project_id: Optional[int], num_variants: int, width: int, height: int):
+        """
+        Create frame records for all variants with one bulk INSERT and one bulk path update.
+
+        All variants are named after the first frame id; preview is the first frame of the
+        sequence (seq_000.png). Returns list of (frame_id, preview_path) ordered by variant.
+        """
+        from models.frame import FrameCreate
+
+        created_frames = await self.frame_service.create_frames_bulk([
+            FrameCreate(
+                path=f"temp_frame_{project_id}_{variant_idx}.mp4",  # Temporary path
+                generator='wan22_i2v',
+                project_id=project_id,
+                variant_id=variant_idx
+            )
+            for variant_idx in range(num_variants)
+        ], variant_group=True)
+
+        naming_frame_id = created_frames[0].id
+        frames_dir = Path(Config.FRAMES_DIR)
+        frames_dir.mkdir(parents=True, exist_ok=True)
+
+        paths = {
+            frame.id: str(frames_dir / f"project_{project_id}_frame_{naming_frame_id}_variant_{frame.variant_id}_seq_000.png")
+            for frame in created_frames
+        }
+        await self.frame_service.update_frame_paths_bulk(paths)
+
+        # Blank previews right away so records never point at missing files
+        for preview_path in paths.values():
+            self._write_blank_preview(preview_path)
+
+        return [(frame.id, paths[frame.id]) for frame in created_frames]
+
+    def _prepare_conditioning(
+        self,
+        prompt: str,
+        negative_prompt: str,
+        width: int,
+        height: int,
+        num_frames: int,
+        start_image_tensor: Optional[torch.Tensor],
+        clip_vision_output: Any
+    ) -> Dict[str, Any]:
+        """Load VAE and text encoder, encode prompts and build WanImageToVideo conditioning + latent"""
+        # 3. Load VAE wan_2.1
+        vae = wan_bricks.load_vae(VAE_WAN_2_1_MODEL)
+        log.info("wan22_i2v_vae_loaded", {"vae_name": VAE_WAN_2_1_MODEL})
+
+        # 4. Load Text Encoder (GGUF)
+        text_encoder = wan_bricks.load_clip(TEXT_ENCODER_MODEL, clip_type="wan")
+        log.info("wan22_i2v_text_encoder_loaded", {"text_encoder_name": TEXT_ENCODER_MODEL})
+
+        # 5. Text Encoding for Positive and Negative
+        positive = comfy_bricks.clip_encode(text_encoder, prompt)
+        negative = comfy_bricks.clip_encode(text_encoder, negative_prompt)
+        log.info("wan22_i2v_text_encoded", {
+            "prompt": prompt[:50] + "..." if len(prompt) > 50 else prompt,
+            "negative_prompt": negative_prompt[:50] + "..." if len(negative_prompt) > 50 else negative_prompt
+        })
+
+        # 6. WanImageToVideo
+        positive, negative, latent_video = wan_bricks.wan_image_to_video(
+            positive=positive,
+            negative=negative,
+            vae=vae,
+            width=width,
+            height=height,
+            length=num_frames,  # User-configurable number of frames
+            batch_size=1,
+            clip_vision_output=clip_vision_output,
+            start_image=start_image_tensor
+        )
+        if WAN22_CHANNELS_LAST:
+            # Video latent is 5D (B, C, T, H, W)
+            latent_video['samples'] = latent_video['samples'].to(memory_format=torch.channels_last_3d)
+
+        log.info("wan22_i2v_latent_video_created", {
+            "width": width,
+            "height": height,
+            "length": num_frames
+        })
+
+        # Sampler does not modify the latent in place, so it is shared by all variants
+        return {
+            'vae': vae,
+            'positive': positive,
+            'negative': negative,
+            'latent_video': latent_video,
+            'num_frames': num_frames
+        }
+
+    def _encode_blank_preview(self, width: int, height: int) -> bytes:
+        """Encode blank preview image as PNG bytes"""
+        buffer = io.BytesIO()
+        blank_img = Image.new('RGB', (width, height), color=(32, 32, 32))
+        blank_img.save(buffer, format='PNG', compress_level=1)
+        return buffer.getvalue()
+
+    def _write_blank_preview(self, path: str):
+        """Create initial preview (blank image) from pre-encoded PNG bytes"""
+        try:
+            with open(path, 'wb') as f:
+                f.write(self._blank_preview_bytes)
+            log.info("wan22_i2v_blank_preview_created", {"path": path})
+        except Exception as e:
+            log.warning("wan22_i2v_preview_error", {"error": str(e)})
+
+    def _load_noise_model(self, stage: str, model_name: str, lightning_lora: str, user_loras: list):
+        """Load HIGH/LOW noise UNet with ModelSamplingSD3, system LoRAs and user LoRAs applied"""
+        model = gguf_bricks.load_unet_gguf(model_name, dtype=self._model_dtype)
+        log.info(f"wan22_i2v_{stage}_model_loaded", {"model": model_name, "dtype": str(self._model_dtype)})
+
+        # Apply ModelSamplingSD3 with shift = 8
+        model = comfy_bricks.model_sampling_sd3(model, shift=8)
+        log.info(f"wan22_i2v_{stage}_model_sampling_applied", {"shift": 8})
+
+        # Apply FusionX LoRA
+        fusion_x_path = os.path.join(Config.MODELS_DIR, "SysLora", SYS_LORA_WAN_2_1_FUSION_X)
+        if os.path.exists(fusion_x_path):
+            model = comfy_bricks.load_lora_model_only(fusion_x_path, model, strength_model=1.0)
+            log.info(f"wan22_i2v_{stage}_fusionx_lora_applied", {"lora": SYS_LORA_WAN_2_1_FUSION_X})
+        else:
+            log.warning(f"wan22_i2v_{stage}_fusionx_lora_not_found", {"path": fusion_x_path})
+
+        # Apply Lightning I2V LoRA for this stage
+        lightning_path = os.path.join(Config.MODELS_DIR, "SysLora", lightning_lora)
+        if os.path.exists(lightning_path):
+            model = comfy_bricks.load_lora_model_only(lightning_path, model, strength_model=1.0)
+            log.info(f"wan22_i2v_{stage}_lightning_lora_applied", {"lora": lightning_lora})
+        else:
+            log.warning(f"wan22_i2v_{stage}_lightning_lora_not_found", {"path": lightning_path})
+
+        # Apply user-specified LoRAs
+        for lora_config in user_loras or []:
+            lora_name = lora_config.get('lora_name')
+            if not lora_name:
+                continue
+
+            strength_model = lora_config.get('strength_model', 1.0)
+            lora_path = os.path.join(Config.MODELS_DIR, "Lora", lora_name)
+
+            if not os.path.exists(lora_path):
+                log.warning(f"wan22_i2v_{stage}_user_lora_not_found", {"lora_path": lora_path})
+                continue
+
+            model = comfy_bricks.load_lora_model_only(lora_path, model, strength_model=strength_model)
+            log.info(f"wan22_i2v_{stage}_user_lora_applied", {
+                "lora_name": lora_name,
+                "strength_model": strength_model
+            })
+
+        if WAN22_CHANNELS_LAST:
+            model.model.diffusion_model.to(memory_format=torch.channels_last_3d)
+            log.info(f"wan22_i2v_{stage}_channels_last_applied")
+
+        if WAN22_TORCH_COMPILE and torch.cuda.is_available():
+            model = comfy_bricks.torch_compile_model(model, mode='reduce-overhead')
+            log.info(f"wan22_i2v_{stage}_torch_compile_enabled")
+        elif WAN22_CUDA_GRAPHS and torch.cuda.is_available():
+            model = comfy_bricks.cuda_graph_model(model)
+            log.info(f"wan22_i2v_{stage}_cuda_graph_enabled")
+
+        return model
+
+    def _resolve_model_dtype(self, precision: str) -> torch.dtype:
+        """Map precision parameter to the dtype usable on ComfyUI's compute device (CUDA, XPU, ...)"""
+        device = comfy.model_management.get_torch_device()
+        if device.type == 'cpu':
+            return torch.float32
+        if precision == 'bf16':
+            # torch.cuda / torch.xpu expose their own is_bf16_supported()
+            is_bf16_supported = getattr(getattr(torch, device.type, None), 'is_bf16_supported', None)
+            if is_bf16_supported is None or not is_bf16_supported():
+                log.warning("wan22_i2v_bf16_unsupported", {"device": device.type, "fallback": "fp16"})
+                return torch.float16
+        return WAN22_PRECISION_DTYPES[precision]
+
+    def _start_model_load(self, stage: str, model_name: str, lightning_lora: str, user_loras: list):
+        """
+        Start loading the model for stage in a worker thread, unless a load is already running
+
+        Loads of different stages run at the same time; the same stage is loaded once.
+        Loading only reads the GGUF/LoRA files and builds the ModelPatcher; moving weights
+        to the GPU happens in load_models_gpu, which comfy_bricks serializes with
+        model_loading_lock. Returns the load future.
+        """
+        load = self._model_loads.get(stage)
+        if load is None:
+            load = asyncio.get_running_loop().run_in_executor(
+                None, self._load_noise_model, stage, model_name, lightning_lora, user_loras
+            )
+            self._model_loads[stage] = load
+        return load
+
+    async def _get_noise_model(self, stage: str, model_name: str, lightning_lora: str, user_loras: list):
+        """Return the model for stage, loading it with LoRAs once per task (off the loop thread)"""
+        model = self._models.get(stage)
+        if model is None:
+            load = self._start_model_load(stage, model_name, lightning_lora, user_loras)
+            try:
+                model = await load
+            finally:
+                if self._model_loads.get(stage) is load:
+                    del self._model_loads[stage]
+            self._models[stage] = model
+        return model
+
+    def _pipeline_enabled(self) -> bool:
+        """Check if HIGH/LOW variant pipelining can be used"""
+        return WAN22_PIPELINE_VARIANTS and torch.cuda.is_available()
+
+    def _models_resident(self) -> bool:
+        """
+        Check that HIGH and LOW models are both fully resident on the GPU
+
+        Required before pipelining a variant, otherwise LOW loading on the loop thread
+        could offload HIGH weights while the worker thread samples with them.
+        """
+        models = [self._models.get('high'), self._models.get('low')]
+        return all(model is not None and comfy_bricks.is_fully_loaded(model) for model in models)
+
+    def _sample_high(self, high_model, latent_video, positive, negative, seed: int):
+        """Run HIGH noise KSampler pass (steps 0 -> WAN22_SPLIT)"""
+        high_latent_video, _ = comfy_bricks.common_ksampler(
+            model=high_model,  # Use loaded HIGH GGUF model
+            latent=latent_video,
+            positive=positive,
+            negative=negative,
+            steps=WAN22_STEPS,
+            cfg=WAN22_CFG_SCALE,
+            sampler_name='dpmpp_2m_sde',
+            scheduler='sgm_uniform',
+            seed=seed,
+            start_step=0,
+            last_step=WAN22_SPLIT,
+            disable_noise=False
+        )
+        return high_latent_video
+
+    def _sample_high_pipelined(self, high_model, latent_video, positive, negative, seed: int):
+        """Run HIGH sampling on stream_a (executed in a worker thread), return latent and done event"""
+        with torch.cuda.stream(self.stream_a):
+            high_latent_video = self._sample_high(high_model, latent_video, positive, negative, seed)
+            high_done = torch.cuda.Event()
+            high_done.record(self.stream_a)
+        return high_latent_video, high_done
+
+    def _sample_low(self, low_model, high_latent_video, positive, negative, seed: int):
+        """Run LOW noise KSampler pass (steps WAN22_SPLIT -> end)"""
+        low_latent_video, _ = comfy_bricks.common_ksampler(
+            model=low_model,  # Use loaded LOW GGUF model
+            latent=high_latent_video,
+            positive=positive,
+            negative=negative,
+            steps=WAN22_STEPS,
+            cfg=WAN22_CFG_SCALE,
+            sampler_name='dpmpp_2m_sde',
+            scheduler='sgm_uniform',
+            seed=seed,
+            start_step=WAN22_SPLIT,
+            last_step=10000,
+            disable_noise=True
+        )
+        return low_latent_video
+
+    async def _release_pipeline(self):
+        """Wait for in-flight pipelined HIGH sampling and model loads, drop task models and pipeline state"""
+        pending_high, self._pending_high = self._pending_high, None
+        if pending_high is not None:
+            try:
+                await pending_high
+            except Exception as e:
+                log.warning("wan22_i2v_pipeline_discard_error", {"error": str(e)})
+        # A prefetch nobody awaited (e.g. HIGH failed) still runs in its worker thread
+        model_loads, self._model_loads = self._model_loads, {}
+        for load in model_loads.values():
+            try:
+                await load
+            except Exception as e:
+                log.warning("wan22_i2v_model_load_discard_error", {"error": str(e)})
+        self._models.clear()
+        self.stream_a = None
+        self.stream_b = None
+
     async def stop(self):
         """Stop Wan22-I2V generation"""
         self.should_stop = True
         self.is_running = False
+        await self._flush_progress()
+        await self._params_writer.flush()
         log.info("wan22_i2v_generation_stopped")
 
     @classmethod
     def get_plugin_info(cls) -> Dict[str, Any]:
         """Get Wan22-I2V plugin information"""
-        return {
-            'name': 'wan22_i2v',
-            'version': '1.0.0',
-            'description': 'Wan22-I2V video generator for image-to-video generation',
-            'author': 'Kino Team',
-            'visible': True,  # Show in UI
-            'model_type': 'video_diffusion',
-            'parameters': {
-                'prompt': {
-                    'type': 'string',
-                    'required': True,
-                    'description': 'Text prompt for video generation',
-                    'example': 'A cat walking in a garden'
-                },
-                'negative_prompt': {
-                    'type': 'string',
-                    'required': False,
-                    'default': 'vivid colors, overexposed, static, blurry details, subtitles, style, artwork, painting, picture, still, overall gray, worst quality, low quality, JPEG artifacts, ugly, incomplete, extra fingers, poorly drawn hands, poorly drawn face, deformed, disfigured, malformed limbs, fused fingers, static frame, cluttered background, three legs, walking backwards, slow motion, slowmo',
-                    'description': 'Negative prompt to avoid certain elements',
-                    'example': 'blurry, low quality, distorted'
-                },
-                'width': {
-                    'type': 'integer',
-                    'required': False,
-                    'default': 256,
-                    'min': 256,
-                    'max': 1024,
-                    'step': 64,
-                    'description': 'Video width in pixels'
-                },
-                'height': {
-                    'type': 'integer',
-                    'required': False,
-                    'default': 256,
-                    'min': 256,
-                    'max': 1024,
-                    'step': 64,
-                    'description': 'Video height in pixels'
-                },
-                'num_frames': {
-                    'type': 'integer',
-                    'required': False,
-                    'default': 17,
-                    'min': 5,
-                    'max': 121,
-                    'step': 4,
-                    'description': 'Number of frames (must be 1 + X * 4, e.g., 5, 9, 13, 17, 21, ..., 81, ..., 121)',
-                    'validation': 'value must satisfy: (value - 1) % 4 == 0'
-                },
-                'seed': {
-                    'type': 'integer',
-                    'required': False,
-                    'description': 'Random seed (leave empty for random)',
-                    'example': 12345
-                },
-                'high_loras': {
-                    'type': 'lora_list',
-                    'required': False,
-                    'description': 'LoRAs applied to HIGH noise model',
-                    'item_schema': {
-                        'lora_name': {
-                            'type': 'string',
-                            'description': 'LoRA filename (must be in models_storage/Lora/ folder)'
-                        },
-                        'strength_model': {
-                            'type': 'float',
-                            'default': 1.0,
-                            'min': 0.0,
-                            'max': 2.0,
-                            'description': 'LoRA strength for model'
-                        }
-                    }
-                },
-                'low_loras': {
-                    'type': 'lora_list',
-                    'required': False,
-                    'description': 'LoRAs applied to LOW noise model',
-                    'item_schema': {
-                        'lora_name': {
-                            'type': 'string',
-                            'description': 'LoRA filename (must be in models_storage/Lora/ folder)'
-                        },
-                        'strength_model': {
-                            'type': 'float',
-                            'default': 1.0,
-                            'min': 0.0,
-                            'max': 2.0,
-                            'description': 'LoRA strength for model'
-                        }
-                    }
-                },
-                'num_variants': {
-                    'type': 'integer',
-                    'required': False,
-                    'default': 1,
-                    'min': 1,
-                    'max': 5,
-                    'description': 'Number of variants to generate'
-                }
-            }
-        }
+        return _PLUGIN_INFO
+
+    def _broadcast_nowait(self, message: Dict[str, Any]):
+        """Queue WebSocket message; it is sent in background, batched with nearby messages"""
+        self._pending_broadcast.add(message)
 
     async def update_progress(self, progress: float, callback: Optional[Callable[[float], None]]):
         """Update progress and call callback if provided"""
         # Ensure progress is within 0-100 range
         self.progress = max(0.0, min(100.0, progress))
         if callback:
-            try:
-                await callback(self.progress)
-            except Exception as e:
-                log.warning("wan22_i2v_progress_callback_error", {"error": str(e)})
+            now = time.monotonic()
+            if (
+                self.progress < 100.0
+                and abs(self.progress - self._last_reported_progress) < PROGRESS_MIN_DELTA
+                and now - self._last_reported_at < PROGRESS_MIN_INTERVAL
+            ):
+                return
+            self._last_reported_progress = self.progress
+            self._last_reported_at = now
+            if self._progress_queue is None:
+                self._progress_queue = asyncio.Queue()
+                self._progress_worker_task = asyncio.create_task(self._progress_worker())
+            self._progress_queue.put_nowait((self.current_frame_id, callback, self.progress))
+
+    async def _progress_worker(self):
+        """Deliver queued progress updates, coalescing bursts to the latest value per frame"""
+        queue = self._progress_queue
+        stopping = False
+        while not stopping:
+            item = await queue.get()
+            await asyncio.sleep(PROGRESS_FLUSH_INTERVAL)
+
+            latest = {}
+            while True:
+                if item is None:
+                    stopping = True
+                else:
+                    frame_id, callback, progress = item
+                    latest.pop(frame_id, None)
+                    latest[frame_id] = (callback, progress)
+                if queue.empty():
+                    break
+                item = queue.get_nowait()
+
+            for callback, progress in latest.values():
+                try:
+                    await callback(progress)
+                except Exception as e:
+                    log.warning("wan22_i2v_progress_callback_error", {"error": str(e)})
+
+    async def _flush_progress(self):
+        """Deliver pending progress updates and stop the progress worker"""
+        if self._progress_queue is None:
+            return
+        queue, task = self._progress_queue, self._progress_worker_task
+        self._progress_queue = None
+        self._progress_worker_task = None
+        queue.put_nowait(None)
+        await task
 
 
 class Wan22I2VPlugin(BasePlugin):
@@ -852,5 +1228,4 @@ class Wan22I2VPlugin(BasePlugin):
     @classmethod
     def get_plugin_info(cls) -> Dict[str, Any]:
         """Get plugin information"""
-        loader = Wan22I2VLoader()
-        return loader.get_plugin_info()
+        return _PLUGIN_INFO
@@ -7,63 +7,76 @@ from aiohttp import web
 from handlers import health, api, projects, frames, generator, api_documented, models, system, websocket
 from config import Config
 
+# URL prefix of the generated frames static route
+FRAMES_URL_PREFIX = '/data/frames'
+
 
 def setup_routes(app: web.Application):
     """Configure all application routes"""
 
-    # Health check endpoint
-    app.router.add_get('/health', health.health_check)
+    # Whole route table is registered in one call
+    app.router.add_routes([
+        # Health check endpoint
+        web.get('/health', health.health_check),
 
-    # WebSocket endpoint for real-time updates
-    app.router.add_get('/ws', websocket.websocket_handler)
+        # WebSocket endpoint for real-time updates
+        web.get('/ws', websocket.websocket_handler),
 
-    # API v1 routes - General
-    app.router.add_get('/api/v1/hello', api.hello)
-    app.router.add_post('/api/v1/echo', api.echo)
-    app.router.add_get('/api/v1/info', api.info)
+        # API v1 routes - General
+        web.get('/api/v1/hello', api.hello),
+        web.post('/api/v1/echo', api.echo),
+        web.get('/api/v1/info', api.info),
 
-    # API v1 routes - Projects
-    app.router.add_get('/api/v1/projects', projects.list_projects)
-    app.router.add_get('/api/v1/projects/{id}', projects.get_project)
-    app.router.add_post('/api/v1/projects', projects.create_project)
-    app.router.add_put('/api/v1/projects/{id}', projects.update_project)
-    app.router.add_delete('/api/v1/projects/{id}', projects.delete_project)
+        # API v1 routes - Projects
+        web.get('/api/v1/projects', projects.list_projects),
+        web.get('/api/v1/projects/{id}', projects.get_project),
+        web.post('/api/v1/projects', projects.create_project),
+        web.put('/api/v1/projects/{id}', projects.update_project),
+        web.delete('/api/v1/projects/{id}', projects.delete_project),
 
-    # Get frames for a specific project
-    app.router.add_get('/api/v1/projects/{id}/frames', frames.get_project_frames)
+        # Get frames for a specific project
+        web.get('/api/v1/projects/{id}/frames', frames.get_project_frames),
 
-    # API v1 routes - Frames
-    app.router.add_get('/api/v1/frames', frames.list_frames)
-    app.router.add_get('/api/v1/frames/{id}', frames.get_frame)
-    app.router.add_get('/api/v1/frames/{id}/params', frames.get_frame_generation_params)
-    app.router.add_post('/api/v1/frames', frames.create_frame)
-    app.router.add_put('/api/v1/frames/{id}', frames.update_frame)
-    app.router.add_delete('/api/v1/frames/{id}', frames.delete_frame)
+        # API v1 routes - Frames
+        web.get('/api/v1/frames', frames.list_frames),
+        web.get('/api/v1/frames/{id}', frames.get_frame),
+        web.get('/api/v1/frames/{id}/params', frames.get_frame_generation_params),
+        web.post('/api/v1/frames', frames.create_frame),
+        web.put('/api/v1/frames/{id}', frames.update_frame),
+        web.delete('/api/v1/frames/{id}', frames.delete_frame),
 
-    # API v1 routes - Generator
-    app.router.add_get('/api/v1/generator/tasks', generator.list_tasks)
-    app.router.add_get('/api/v1/generator/tasks/{id}', generator.get_task)
-    app.router.add_post('/api/v1/generator/tasks', generator.create_task)
-    app.router.add_post('/api/v1/generator/tasks/{id}/generate', generator.start_task)
-    app.router.add_post('/api/v1/generator/tasks/{id}/stop', generator.stop_task)
-    app.router.add_get('/api/v1/generator/tasks/{id}/progress', generator.get_task_progress)
-    app.router.add_get('/api/v1/generator/plugins', generator.get_plugins)
+        # API v1 routes - Generator
+        web.get('/api/v1/generator/tasks', generator.list_tasks),
+        web.get('/api/v1/generator/tasks/{id}', generator.get_task),
+        web.post('/api/v1/generator/tasks', generator.create_task),
+        web.post('/api/v1/generator/tasks/{id}/generate', generator.start_task),
+        web.post('/api/v1/generator/tasks/{id}/stop', generator.stop_task),
+        web.get('/api/v1/generator/tasks/{id}/progress', generator.get_task_progress),
+        web.get('/api/v1/generator/plugins', generator.get_plugins),
 
-    # API v1 routes - Models
-    app.router.add_get('/api/v1/models/categories', models.get_model_categories)
-    app.router.add_get('/api/v1/models/{category}', models.get_models_by_category)
-    app.router.add_get('/api/v1/models/{category}/{filename}', models.get_model_info)
+        # API v1 routes - Models
+        web.get('/api/v1/models/categories', models.get_model_categories),
+        web.get('/api/v1/models/{category}', models.get_models_by_category),
+        web.get('/api/v1/models/{category}/{filename}', models.get_model_info),
 
-    # API v1 routes - System Control
-    app.router.add_post('/api/v1/system/emergency-stop', system.emergency_stop)
-    app.router.add_post('/api/v1/system/restart', system.restart_server)
-    app.router.add_post('/api/v1/system/shutdown', system.shutdown_server)
+        # API v1 routes - System Control
+        web.post('/api/v1/system/emergency-stop', system.emergency_stop),
+        web.post('/api/v1/system/restart', system.restart_server),
+        web.post('/api/v1/system/shutdown', system.shutdown_server),
 
-    # Documented API v2 routes (with OpenAPI auto-documentation)
-    # These use PydanticView for automatic Swagger documentation
-    app.router.add_view('/api/v2/projects', api_documented.ProjectsView)
-    app.router.add_view('/api/v2/projects/{project_id}', api_documented.ProjectView)
+        # Documented API v2 routes (with OpenAPI auto-documentation)
+        # These use PydanticView for automatic Swagger documentation
+        web.view('/api/v2/projects', api_documented.ProjectsView),
+        web.view('/api/v2/projects/{project_id}', api_documented.ProjectView),
+    ])
 
     # Static files routes
-    # Serve generated frames from data/frames directory
-    app.router.add_static('/data/frames', Config.FRAMES_DIR, show_index=False)
+    # Serve generated frames from data/frames directory (sent with sendfile(2) where supported;
+    # Cache-Control is set by frames_cache_middleware in main.py)
+    app.router.add_static(
+        FRAMES_URL_PREFIX,
+        Config.FRAMES_DIR,
+        show_index=False,
+        follow_symlinks=False,
+        append_version=False
+    )
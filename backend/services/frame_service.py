@@ -1,10 +1,80 @@
 """
 Frame business logic service
 """
-from typing import Optional, List
-from datetime import datetime
-from database import Database
+import asyncio
+import base64
+import binascii
+import os
+from typing import AsyncIterator, Optional, List, Dict, Tuple
+import aiosqlite
+from database import Database, DB_STREAM_PAGE_SIZE, utc_now_iso
 from models.frame import FrameCreate, FrameUpdate, FrameResponse
+from logger import get_logger
+
+log = get_logger("frame")
+
+# File removal of deleted frames: paths per worker-thread call and calls running at once
+UNLINK_BATCH_SIZE = 256
+UNLINK_CONCURRENCY = 4
+
+# Columns of a FrameResponse row, shared by SELECT and RETURNING clauses
+FRAME_COLUMNS = "id, path, generator, project_id, variant_id, parent_frame_id, created_at, updated_at"
+
+# Fixed statement text for the hot lookup: every call hits the connection's statement cache
+_SELECT_FRAME_BY_ID = f"SELECT {FRAME_COLUMNS} FROM frames WHERE id = ?"
+
+
+def _bulk_unlink(paths: List[str]) -> None:
+    """Remove files (blocking), paths that do not exist are skipped"""
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            log.warning("frame_file_delete_failed", extra={"path": path, "error": str(e)})
+
+
+async def unlink_frame_files(frame_paths: List[str]) -> None:
+    """
+    Remove image and generation parameters files of deleted frames
+
+    Files are removed in worker threads, UNLINK_BATCH_SIZE paths per call with at
+    most UNLINK_CONCURRENCY calls at once, so large projects neither run serially
+    nor flood the default executor.
+    """
+    paths = []
+    for path in frame_paths:
+        paths.append(path)
+        paths.append(os.path.splitext(path)[0] + '.json')  # Parameters sidecar
+
+    if len(paths) <= UNLINK_BATCH_SIZE:
+        await asyncio.to_thread(_bulk_unlink, paths)
+        return
+
+    semaphore = asyncio.Semaphore(UNLINK_CONCURRENCY)
+
+    async def unlink_batch(batch: List[str]):
+        async with semaphore:
+            await asyncio.to_thread(_bulk_unlink, batch)
+
+    async with asyncio.TaskGroup() as group:
+        for start in range(0, len(paths), UNLINK_BATCH_SIZE):
+            group.create_task(unlink_batch(paths[start:start + UNLINK_BATCH_SIZE]))
+
+
+def encode_frame_cursor(frame: FrameResponse) -> str:
+    """Encode pagination cursor pointing after the given frame"""
+    return base64.urlsafe_b64encode(f"{frame.created_at}|{frame.id}".encode()).decode()
+
+
+def decode_frame_cursor(cursor: str) -> Tuple[str, int]:
+    """Decode pagination cursor into (created_at, id); raises ValueError if invalid"""
+    try:
+        created_at, frame_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit('|', 1)
+        return created_at, int(frame_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
 
 
 class FrameService:
@@ -13,99 +83,178 @@ class FrameService:
     def __init__(self, db: Database):
         self.db = db
 
-    async def get_all_frames(self, project_id: Optional[int] = None) -> List[FrameResponse]:
+    @staticmethod
+    def _row_to_frame(row) -> FrameResponse:
+        """
+        Convert database row to FrameResponse
+
+        Rows were validated on write and SQLite column types already match the
+        model, so validation is skipped with model_construct.
+        """
+        return FrameResponse.model_construct(
+            id=row['id'],
+            path=row['path'],
+            generator=row['generator'],
+            project_id=row['project_id'],
+            variant_id=row['variant_id'],
+            parent_frame_id=row['parent_frame_id'],
+            created_at=row['created_at'],
+            updated_at=row['updated_at']
+        )
+
+    async def get_all_frames(
+        self,
+        project_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> List[FrameResponse]:
         """
         Get all frames, optionally filtered by project_id
+
+        Frames of a project are ordered oldest first, the global list newest first.
+        With limit, returns one page; pass encode_frame_cursor(last frame) as
+        cursor to continue after it (keyset pagination on created_at, id).
+        """
+        return [frame async for frame in self.iter_all_frames(project_id, limit, cursor)]
+
+    async def iter_all_frames(
+        self,
+        project_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> AsyncIterator[FrameResponse]:
+        """
+        Yield frames one by one, same filtering and order as get_all_frames
+
+        Rows are read in pages of DB_STREAM_PAGE_SIZE (keyset on created_at, id);
+        no reader connection is held while the caller consumes a page.
         """
         if project_id is not None:
-            query = """
-                SELECT id, path, generator, project_id, variant_id, created_at, updated_at
-                FROM frames
-                WHERE project_id = ?
-                ORDER BY created_at ASC
-            """
-            rows = await self.db.fetch_all(query, (project_id,))
+            order = "ASC"
         else:
-            query = """
-                SELECT id, path, generator, project_id, variant_id, created_at, updated_at
+            order = "DESC"
+
+        after = decode_frame_cursor(cursor) if cursor is not None else None
+        remaining = limit
+
+        while remaining is None or remaining > 0:
+            conditions = []
+            params = []
+            if project_id is not None:
+                conditions.append("project_id = ?")
+                params.append(project_id)
+            if after is not None:
+                conditions.append(f"(created_at, id) {'>' if order == 'ASC' else '<'} (?, ?)")
+                params.extend(after)
+
+            page_size = DB_STREAM_PAGE_SIZE if remaining is None else min(DB_STREAM_PAGE_SIZE, remaining)
+            query = f"""
+                SELECT {FRAME_COLUMNS}
                 FROM frames
-                ORDER BY created_at DESC
+                {('WHERE ' + ' AND '.join(conditions)) if conditions else ''}
+                ORDER BY created_at {order}, id {order}
+                LIMIT ?
             """
-            rows = await self.db.fetch_all(query)
+            params.append(page_size)
 
-        frames = []
-        for row in rows:
-            frames.append(FrameResponse(
-                id=row['id'],
-                path=row['path'],
-                generator=row['generator'],
-                project_id=row['project_id'],
-                variant_id=row['variant_id'],
-                created_at=row['created_at'],
-                updated_at=row['updated_at']
-            ))
-
-        return frames
+            rows = await self.db.fetch_all(query, tuple(params))
+            for row in rows:
+                yield self._row_to_frame(row)
+
+            if len(rows) < page_size:
+                return
+            if remaining is not None:
+                remaining -= len(rows)
+            after = (rows[-1]['created_at'], rows[-1]['id'])
 
     async def get_frame_by_id(self, frame_id: int) -> Optional[FrameResponse]:
         """Get frame by ID"""
-        query = """
-            SELECT id, path, generator, project_id, variant_id, created_at, updated_at
-            FROM frames
-            WHERE id = ?
-        """
-        row = await self.db.fetch_one(query, (frame_id,))
+        row = await self.db.fetch_one(_SELECT_FRAME_BY_ID, (frame_id,))
 
         if not row:
             return None
 
-        return FrameResponse(
-            id=row['id'],
-            path=row['path'],
-            generator=row['generator'],
-            project_id=row['project_id'],
-            variant_id=row['variant_id'],
-            created_at=row['created_at'],
-            updated_at=row['updated_at']
-        )
+        return self._row_to_frame(row)
 
     async def create_frame(self, frame: FrameCreate) -> FrameResponse:
         """Create a new frame"""
-        # Verify that project exists
-        project_query = "SELECT id FROM projects WHERE id = ?"
-        project = await self.db.fetch_one(project_query, (frame.project_id,))
-        if not project:
-            raise ValueError(f"Project with id {frame.project_id} does not exist")
-
         query = """
-            INSERT INTO frames (path, generator, project_id, variant_id, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?)
+            INSERT INTO frames (path, generator, project_id, variant_id, parent_frame_id, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            RETURNING id, path, generator, project_id, variant_id,
+                COALESCE(parent_frame_id, id) AS parent_frame_id, created_at, updated_at
+        """
+        now = utc_now_iso()
+
+        # parent_frame_id defaults to the frame's own id (trigger trg_frames_parent_default);
+        # RETURNING runs before the trigger, hence the COALESCE
+        try:
+            row = await self.db.execute_returning_one(
+                query,
+                (frame.path, frame.generator, frame.project_id, frame.variant_id, frame.parent_frame_id, now, now)
+            )
+        except aiosqlite.IntegrityError as e:
+            # FOREIGN KEY (project_id) constraint failed
+            raise ValueError(f"Project with id {frame.project_id} does not exist") from e
+        if not row:
+            raise RuntimeError("Failed to create frame")
+
+        return self._row_to_frame(row)
+
+    async def create_frames_bulk(self, frames: List[FrameCreate], variant_group: bool = False) -> List[FrameResponse]:
         """
-        now = datetime.utcnow().isoformat()
+        Create several frames with one executemany in a single transaction, returned in insertion order
 
-        frame_id = await self.db.execute(
-            query,
-            (frame.path, frame.generator, frame.project_id, frame.variant_id, now, now)
-        )
+        With variant_group=True the frames are variants of one generation: all of them get
+        the id of the first inserted frame as parent_frame_id.
+        """
+        if not frames:
+            return []
 
-        # Fetch the created frame
-        created_frame = await self.get_frame_by_id(frame_id)
-        if not created_frame:
-            raise RuntimeError("Failed to create frame")
+        now = utc_now_iso()
+        insert_query = """
+            INSERT INTO frames (path, generator, project_id, variant_id, parent_frame_id, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """
+        select_query = f"""
+            SELECT {FRAME_COLUMNS}
+            FROM frames
+            WHERE id BETWEEN ? AND ?
+            ORDER BY id
+        """
 
-        return created_frame
+        # Project existence is enforced by the FOREIGN KEY constraint; the whole batch is rolled back
+        try:
+            async with self.db.transaction() as cursor:
+                await cursor.executemany(insert_query, [
+                    (frame.path, frame.generator, frame.project_id, frame.variant_id, frame.parent_frame_id, now, now)
+                    for frame in frames
+                ])
+                # Single writer inside one transaction: new ids are consecutive
+                await cursor.execute("SELECT last_insert_rowid()")
+                last_id = (await cursor.fetchone())[0]
+                first_id = last_id - len(frames) + 1
+                if variant_group:
+                    await cursor.execute(
+                        "UPDATE frames SET parent_frame_id = ? WHERE id BETWEEN ? AND ?",
+                        (first_id, first_id, last_id)
+                    )
+                await cursor.execute(select_query, (first_id, last_id))
+                rows = await cursor.fetchall()
+        except aiosqlite.IntegrityError as e:
+            project_ids = sorted({frame.project_id for frame in frames})
+            if len(project_ids) == 1:
+                raise ValueError(f"Project with id {project_ids[0]} does not exist") from e
+            raise ValueError(f"One of projects {project_ids} does not exist") from e
+
+        return [self._row_to_frame(row) for row in rows]
 
     async def update_frame(
         self,
         frame_id: int,
         frame_update: FrameUpdate
     ) -> Optional[FrameResponse]:
-        """Update an existing frame"""
-        # Check if frame exists
-        existing = await self.get_frame_by_id(frame_id)
-        if not existing:
-            return None
-
+        """Update an existing frame (None if frame not found)"""
         # Build dynamic update query
         update_fields = []
         params = []
@@ -119,12 +268,7 @@ class FrameService:
             params.append(frame_update.generator)
 
         if frame_update.project_id is not None:
-            # Verify new project exists
-            project_query = "SELECT id FROM projects WHERE id = ?"
-            project = await self.db.fetch_one(project_query, (frame_update.project_id,))
-            if not project:
-                raise ValueError(f"Project with id {frame_update.project_id} does not exist")
-
+            # Project existence is enforced by the FOREIGN KEY constraint
             update_fields.append("project_id = ?")
             params.append(frame_update.project_id)
 
@@ -134,11 +278,11 @@ class FrameService:
 
         if not update_fields:
             # Nothing to update
-            return existing
+            return await self.get_frame_by_id(frame_id)
 
         # Add updated_at
         update_fields.append("updated_at = ?")
-        params.append(datetime.utcnow().isoformat())
+        params.append(utc_now_iso())
 
         # Add frame_id for WHERE clause
         params.append(frame_id)
@@ -147,12 +291,15 @@ class FrameService:
             UPDATE frames
             SET {', '.join(update_fields)}
             WHERE id = ?
+            RETURNING {FRAME_COLUMNS}
         """
 
-        await self.db.execute(query, tuple(params))
+        try:
+            row = await self.db.execute_returning_one(query, tuple(params))
+        except aiosqlite.IntegrityError as e:
+            raise ValueError(f"Project with id {frame_update.project_id} does not exist") from e
 
-        # Fetch updated frame
-        return await self.get_frame_by_id(frame_id)
+        return self._row_to_frame(row) if row else None
 
     async def delete_frame(self, frame_id: int) -> bool:
         """Delete a frame and all its variants"""
@@ -161,59 +308,26 @@ class FrameService:
         if not base_frame:
             return False
 
-        # Find all variants of this frame by looking for frames with same project_id
-        # and same frame_id in the path
-        import os
-        from pathlib import Path
-
-        base_path = Path(base_frame.path)
-        base_name = base_path.stem  # filename without extension
-
-        # Extract the frame_id from the filename
-        # Format: project_{project_id}_frame_{frame_id}_variant_{variant_id}.png
-        # We want to match: project_{project_id}_frame_{frame_id}
-        path_parts = base_name.split('_')
-        if len(path_parts) >= 4:
-            frame_id_part = path_parts[3]  # frame_id
-            project_id_part = path_parts[1]  # project_id
-            base_pattern = f"project_{project_id_part}_frame_{frame_id_part}"
-        else:
-            # Fallback to old format for backward compatibility
-            base_parts = base_name.split('_v')[0]
-            base_pattern = base_parts
-
-        # Query all frames in the same project with matching base pattern
+        # One DELETE for the whole variant group (index idx_frames_parent), paths come back via RETURNING
         query = """
-            SELECT id, path FROM frames
-            WHERE project_id = ? AND path LIKE ?
+            DELETE FROM frames
+            WHERE parent_frame_id = ?
+            RETURNING id, path
         """
-        pattern = f"%{base_pattern}%"  # Match base name pattern
-        variant_rows = await self.db.fetch_all(query, (base_frame.project_id, pattern))
-
-        # Delete all variant files and database records
-        deleted_count = 0
-        for row in variant_rows:
-            try:
-                # Delete image file
-                if os.path.exists(row['path']):
-                    os.remove(row['path'])
-                    print(f"Deleted image file: {row['path']}")
-
-                # Delete JSON file
-                json_path = row['path'].replace('.png', '.json')
-                if os.path.exists(json_path):
-                    os.remove(json_path)
-                    print(f"Deleted parameters file: {json_path}")
-
-                # Delete from database
-                delete_query = "DELETE FROM frames WHERE id = ?"
-                await self.db.execute(delete_query, (row['id'],))
-                deleted_count += 1
-
-            except Exception as e:
-                print(f"Warning: Failed to delete variant {row['id']}: {e}")
-
-        return deleted_count > 0
+        deleted_rows = await self.db.execute_returning(query, (base_frame.parent_frame_id or base_frame.id,))
+
+        await unlink_frame_files([row['path'] for row in deleted_rows])
+
+        return len(deleted_rows) > 0
+
+    async def update_frame_paths_bulk(self, paths: Dict[int, str]) -> None:
+        """Update paths of several frames in one transaction (frame_id -> path)"""
+        if not paths:
+            return
+
+        now = utc_now_iso()
+        query = "UPDATE frames SET path = ?, updated_at = ? WHERE id = ?"
+        await self.db.execute_many(query, [(path, now, frame_id) for frame_id, path in paths.items()])
 
     async def get_frames_by_project(self, project_id: int) -> List[FrameResponse]:
         """Get all frames for a specific project"""
@@ -221,35 +335,35 @@ class FrameService:
 
     async def get_frame_variants(self, frame_id: int) -> List[FrameResponse]:
         """Get all variants of a specific frame"""
-        base_frame = await self.get_frame_by_id(frame_id)
-        if not base_frame:
-            return []
+        variants = await self.get_variants_for_frames([frame_id])
+        return variants.get(frame_id, [])
 
-        # Find all variants by looking for frames with same project_id and base name
-        from pathlib import Path
-        base_path = Path(base_frame.path)
-        base_name = base_path.stem.split('_v')[0]  # Remove variant suffix if present
+    async def get_variants_for_frames(self, frame_ids: List[int]) -> Dict[int, List[FrameResponse]]:
+        """
+        Get variants of several frames with one query
 
-        query = """
-            SELECT id, path, generator, project_id, variant_id, created_at, updated_at
-            FROM frames
-            WHERE project_id = ? AND path LIKE ?
-            ORDER BY variant_id ASC
+        Returns frame_id -> variants of its group ordered by variant_id; unknown frame ids are
+        left out. Any frame of a group (not only the base one) can be passed.
+        """
+        if not frame_ids:
+            return {}
+
+        # Join through parent_frame_id (index idx_frames_parent) resolves each frame's group
+        placeholders = ", ".join("?" for _ in frame_ids)
+        query = f"""
+            SELECT f.id AS requested_id,
+                   v.id, v.path, v.generator, v.project_id, v.variant_id, v.parent_frame_id,
+                   v.created_at, v.updated_at
+            FROM frames f
+            JOIN frames v ON v.parent_frame_id = f.parent_frame_id
+            WHERE f.id IN ({placeholders})
+            ORDER BY f.id, v.variant_id ASC
         """
-        pattern = f"%{base_name}%"
-        rows = await self.db.fetch_all(query, (base_frame.project_id, pattern))
+        rows = await self.db.fetch_all(query, tuple(frame_ids))
 
-        variants = []
+        variants: Dict[int, List[FrameResponse]] = {}
         for row in rows:
-            variants.append(FrameResponse(
-                id=row['id'],
-                path=row['path'],
-                generator=row['generator'],
-                project_id=row['project_id'],
-                variant_id=row['variant_id'],
-                created_at=row['created_at'],
-                updated_at=row['updated_at']
-            ))
+            variants.setdefault(row['requested_id'], []).append(self._row_to_frame(row))
 
         return variants
 
@@ -271,14 +385,14 @@ class FrameService:
         Returns:
             Updated FrameResponse or None if frame not found
         """
-        query = """
+        query = f"""
             UPDATE frames
             SET path = ?, updated_at = ?
             WHERE id = ?
+            RETURNING {FRAME_COLUMNS}
         """
-        now = datetime.utcnow().isoformat()
-        await self.db.execute(query, (new_path, now, frame_id))
+        now = utc_now_iso()
+        row = await self.db.execute_returning_one(query, (new_path, now, frame_id))
 
-        # Fetch updated frame
-        return await self.get_frame_by_id(frame_id)
+        return self._row_to_frame(row) if row else None
 
@@ -1,15 +1,121 @@
 """
 Generator service for managing generation tasks
 """
-import json
 import asyncio
-from typing import Optional, List, Dict, Any
-from datetime import datetime
-from database import Database
+import orjson
+from typing import AsyncIterator, Optional, List, Dict, Any, Mapping
+from database import Database, DB_STREAM_PAGE_SIZE, QueryCache, build_update_templates, utc_now_iso
 from models.task import TaskCreate, TaskResponse, TaskStatus
 from plugins.plugin_loader import PluginRegistry
+from handlers.websocket import PendingBroadcast
 from logger import get_logger
 
+log = get_logger("generator")
+
+# Progress ticks are coalesced per task and written to DB at most once per interval
+# (seconds); live value stays on the plugin instance
+TASK_PROGRESS_FLUSH_INTERVAL = 0.25
+
+# Columns of a TaskResponse row, shared by SELECT and RETURNING clauses
+TASK_COLUMNS = (
+    "id, name, type, data, status, progress, result, error, "
+    "created_at, updated_at, started_at, completed_at"
+)
+
+# Fixed statement text for the hot lookup: every call hits the connection's statement cache
+_SELECT_TASK_BY_ID = f"SELECT {TASK_COLUMNS} FROM tasks WHERE id = ?"
+
+# update_task_status statements for every combination of optional columns (bitmask -> SQL)
+_STATUS_UPDATE_OPTIONAL = (
+    "progress = ?",
+    "result = ?",
+    "error = ?",
+    "started_at = COALESCE(started_at, ?)",  # started_at is kept if the task already ran
+    "completed_at = ?",
+)
+_UPDATE_PROGRESS, _UPDATE_RESULT, _UPDATE_ERROR, _UPDATE_STARTED_AT, _UPDATE_COMPLETED_AT = (
+    1 << bit for bit in range(len(_STATUS_UPDATE_OPTIONAL))
+)
+_STATUS_UPDATE_QUERIES = build_update_templates(
+    "tasks", ("status = ?", "updated_at = ?"), _STATUS_UPDATE_OPTIONAL
+)
+_STATUS_UPDATE_RETURNING_QUERIES = build_update_templates(
+    "tasks", ("status = ?", "updated_at = ?"), _STATUS_UPDATE_OPTIONAL, returning=TASK_COLUMNS
+)
+
+_FINAL_STATUSES = frozenset((TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.STOPPED))
+
+
+def frames_updated_message(frames: list) -> dict:
+    """Combine buffered frame updates into one frames_updated message"""
+    return {'type': 'frames_updated', 'data': frames}
+
+
+# Frame updates of all tasks (GeneratorService is created per request) are coalesced
+# and sent as one frames_updated message per BROADCAST_FLUSH_DELAY window
+_frame_updates = PendingBroadcast(build_message=frames_updated_message)
+
+
+class TaskProgressWriter:
+    """
+    Background writer for task progress
+
+    put() only records the latest value per task; every `interval` seconds
+    the dirty tasks are written in one executemany transaction. Rows that are no longer
+    running are left alone, so a late flush never overrides a final status.
+    A failed flush is logged and its batch retried on the next interval.
+    """
+
+    def __init__(self, interval: float = TASK_PROGRESS_FLUSH_INTERVAL):
+        self.interval = interval
+        self._pending: Dict[int, float] = {}
+        self._db: Optional[Database] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def put(self, db: Database, task_id: int, progress: float) -> None:
+        """Record latest progress of a task (must be called from the event loop)"""
+        self._db = db
+        self._pending[task_id] = progress
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def pending(self, task_id: int) -> Optional[float]:
+        """Latest progress of a task not written to DB yet (None if nothing is pending)"""
+        return self._pending.get(task_id)
+
+    def discard(self, task_id: int) -> None:
+        """Drop unwritten progress of a task (its final status is written directly)"""
+        self._pending.pop(task_id, None)
+
+    async def _run(self):
+        """Write pending progress until there is nothing left"""
+        while True:
+            await asyncio.sleep(self.interval)
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            now = utc_now_iso()
+            running = TaskStatus.RUNNING.value
+            try:
+                await self._db.execute_many(
+                    "UPDATE tasks SET progress = ?, updated_at = ? WHERE id = ? AND status = ?",
+                    [(progress, now, task_id, running) for task_id, progress in pending.items()]
+                )
+            except Exception as e:
+                # Keep the batch for the next flush, newer put() values win
+                log.warning("task_progress_flush_failed", extra={"tasks": len(pending), "error": str(e)})
+                for task_id, progress in pending.items():
+                    self._pending.setdefault(task_id, progress)
+                continue
+            _tasks_cache.invalidate()
+
+
+# Shared by all GeneratorService instances (created per request)
+_progress_writer = TaskProgressWriter()
+
+# Full (unpaginated) get_all_tasks result, dropped on every task write
+_tasks_cache = QueryCache()
+
 
 class GeneratorService:
     """Service for managing generator tasks"""
@@ -19,109 +125,186 @@ class GeneratorService:
         self.running_tasks: Dict[int, Any] = {}  # Store running plugin instances
         self.log = get_logger("generator")
 
-    async def get_all_tasks(self) -> List[TaskResponse]:
-        """Get all tasks"""
-        query = """
-            SELECT id, name, type, data, status, progress, result, error,
-                   created_at, updated_at, started_at, completed_at
-            FROM tasks
-            ORDER BY created_at DESC
+    async def get_all_tasks(
+        self,
+        limit: Optional[int] = None,
+        before_id: Optional[int] = None
+    ) -> List[TaskResponse]:
+        """
+        Get all tasks, newest first
+
+        With limit, returns one page; pass the id of the last task as
+        before_id to continue after it (keyset pagination on created_at, id).
+        The full list is cached until the next task write.
+        """
+        if limit is not None or before_id is not None:
+            return [task async for task in self.iter_all_tasks(limit, before_id)]
+
+        cached = _tasks_cache.get()
+        if cached is not None:
+            return list(cached)
+
+        version = _tasks_cache.version
+        tasks = [task async for task in self.iter_all_tasks()]
+        _tasks_cache.set(version, tasks)
+        return list(tasks)
+
+    async def iter_all_tasks(
+        self,
+        limit: Optional[int] = None,
+        before_id: Optional[int] = None
+    ) -> AsyncIterator[TaskResponse]:
+        """
+        Yield tasks one by one, same filtering and order as get_all_tasks
+
+        Rows are read in pages of DB_STREAM_PAGE_SIZE (keyset on created_at, id);
+        no reader connection is held while the caller consumes a page.
         """
-        rows = await self.db.fetch_all(query)
+        after = None  # (created_at, id) of the last task of the previous page
+        remaining = limit
+
+        while remaining is None or remaining > 0:
+            params = []
+            where = ''
+            if after is not None:
+                where = "WHERE (created_at, id) < (?, ?)"
+                params.extend(after)
+            elif before_id is not None:
+                where = "WHERE (created_at, id) < (SELECT created_at, id FROM tasks WHERE id = ?)"
+                params.append(before_id)
+
+            page_size = DB_STREAM_PAGE_SIZE if remaining is None else min(DB_STREAM_PAGE_SIZE, remaining)
+            query = f"""
+                SELECT {TASK_COLUMNS}
+                FROM tasks
+                {where}
+                ORDER BY created_at DESC, id DESC
+                LIMIT ?
+            """
+            params.append(page_size)
 
-        tasks = []
-        for row in rows:
-            tasks.append(self._row_to_task_response(row))
+            rows = await self.db.fetch_all(query, tuple(params))
+            for row in rows:
+                yield self._row_to_task_response(row)
 
-        return tasks
+            if len(rows) < page_size:
+                return
+            if remaining is not None:
+                remaining -= len(rows)
+            after = (rows[-1]['created_at'], rows[-1]['id'])
 
     async def get_task_by_id(self, task_id: int) -> Optional[TaskResponse]:
         """Get task by ID"""
-        query = """
-            SELECT id, name, type, data, status, progress, result, error,
-                   created_at, updated_at, started_at, completed_at
-            FROM tasks
-            WHERE id = ?
-        """
-        row = await self.db.fetch_one(query, (task_id,))
+        row = await self.db.fetch_one(_SELECT_TASK_BY_ID, (task_id,))
 
         if not row:
             return None
 
         return self._row_to_task_response(row)
 
+    async def get_task_with_progress(self, task_id: int) -> Optional[TaskResponse]:
+        """Get task by ID with progress not yet flushed by the progress writer applied"""
+        task = await self.get_task_by_id(task_id)
+        if task is not None:
+            progress = _progress_writer.pending(task_id)
+            if progress is not None:
+                task.progress = progress
+        return task
+
     async def create_task(self, task: TaskCreate) -> TaskResponse:
         """Create a new task"""
         # Verify plugin exists
         if not PluginRegistry.is_registered(task.type):
             raise ValueError(f"Plugin type '{task.type}' is not registered")
 
-        query = """
+        query = f"""
             INSERT INTO tasks (name, type, data, status, progress, created_at, updated_at)
             VALUES (?, ?, ?, ?, ?, ?, ?)
+            RETURNING {TASK_COLUMNS}
         """
-        now = datetime.utcnow().isoformat()
-        data_json = json.dumps(task.data)
+        now = utc_now_iso()
+        data_json = orjson.dumps(task.data).decode()
 
-        task_id = await self.db.execute(
+        row = await self.db.execute_returning_one(
             query,
             (task.name, task.type, data_json, TaskStatus.PENDING.value, 0.0, now, now)
         )
-
-        created_task = await self.get_task_by_id(task_id)
-        if not created_task:
+        _tasks_cache.invalidate()
+        if not row:
             raise RuntimeError("Failed to create task")
 
+        created_task = self._row_to_task_response(row)
+
         self.log.info("task_created", extra={"task_id": created_task.id, "type": created_task.type})
         return created_task
 
-    async def update_task_status(
-        self,
+    @staticmethod
+    def _status_update_query(
         task_id: int,
         status: TaskStatus,
-        progress: Optional[float] = None,
-        result: Optional[Dict[str, Any]] = None,
-        error: Optional[str] = None
-    ) -> Optional[TaskResponse]:
-        """Update task status and optionally other fields"""
-        existing = await self.get_task_by_id(task_id)
-        if not existing:
-            return None
-
-        update_fields = ["status = ?", "updated_at = ?"]
-        params = [status.value, datetime.utcnow().isoformat()]
+        progress: Optional[float],
+        result: Optional[Dict[str, Any]],
+        error: Optional[str],
+        returning: bool = False
+    ):
+        """Pick the precompiled UPDATE for a status change, returns (query, params)"""
+        # One timestamp for every field touched by this update
+        now = utc_now_iso()
+        mask = 0
+        params = [status.value, now]
 
         if progress is not None:
-            update_fields.append("progress = ?")
+            mask |= _UPDATE_PROGRESS
             params.append(progress)
 
         if result is not None:
-            update_fields.append("result = ?")
-            params.append(json.dumps(result))
+            mask |= _UPDATE_RESULT
+            params.append(orjson.dumps(result).decode())
 
         if error is not None:
-            update_fields.append("error = ?")
+            mask |= _UPDATE_ERROR
             params.append(error)
 
-        # Update timestamps
-        if status == TaskStatus.RUNNING and existing.started_at is None:
-            update_fields.append("started_at = ?")
-            params.append(datetime.utcnow().isoformat())
+        # Update timestamps (started_at is kept if the task already ran)
+        if status == TaskStatus.RUNNING:
+            mask |= _UPDATE_STARTED_AT
+            params.append(now)
 
-        if status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.STOPPED]:
-            update_fields.append("completed_at = ?")
-            params.append(datetime.utcnow().isoformat())
+        if status in _FINAL_STATUSES:
+            mask |= _UPDATE_COMPLETED_AT
+            params.append(now)
 
         params.append(task_id)
 
-        query = f"""
-            UPDATE tasks
-            SET {', '.join(update_fields)}
-            WHERE id = ?
-        """
+        templates = _STATUS_UPDATE_RETURNING_QUERIES if returning else _STATUS_UPDATE_QUERIES
+        return templates[mask], tuple(params)
 
-        await self.db.execute(query, tuple(params))
-        return await self.get_task_by_id(task_id)
+    async def update_task_status(
+        self,
+        task_id: int,
+        status: TaskStatus,
+        progress: Optional[float] = None,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> Optional[TaskResponse]:
+        """Update task status and optionally other fields (None if task not found)"""
+        query, params = self._status_update_query(task_id, status, progress, result, error, returning=True)
+        row = await self.db.execute_returning_one(query, params)
+        _tasks_cache.invalidate()
+        return self._row_to_task_response(row) if row else None
+
+    async def update_task_status_nowait(
+        self,
+        task_id: int,
+        status: TaskStatus,
+        progress: Optional[float] = None,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """Same as update_task_status for callers that don't need the updated task (no RETURNING)"""
+        query, params = self._status_update_query(task_id, status, progress, result, error)
+        await self.db.execute(query, params)
+        _tasks_cache.invalidate()
 
     async def start_generation(self, task_id: int) -> bool:
         """Start generation for a task"""
@@ -135,7 +318,7 @@ class GeneratorService:
         # Get plugin class
         plugin_class = PluginRegistry.get_plugin(task.type)
         if not plugin_class:
-            await self.update_task_status(
+            await self.update_task_status_nowait(
                 task_id,
                 TaskStatus.FAILED,
                 error=f"Plugin '{task.type}' not found"
@@ -147,7 +330,7 @@ class GeneratorService:
         self.running_tasks[task_id] = plugin
 
         # Update status to running
-        await self.update_task_status(task_id, TaskStatus.RUNNING, progress=0.0)
+        await self.update_task_status_nowait(task_id, TaskStatus.RUNNING, progress=0.0)
         self.log.info("task_started", extra={"task_id": task_id, "type": task.type})
 
         # Start generation in background
@@ -163,9 +346,9 @@ class GeneratorService:
     ):
         """Run generation in background"""
         try:
-            # Progress callback
+            # Progress callback: coalesced by the shared background writer
             async def progress_callback(progress: float):
-                await self.update_task_status(task_id, TaskStatus.RUNNING, progress=progress)
+                _progress_writer.put(self.db, task_id, progress)
 
             # Run generation
             self.log.info("generation_begin", extra={"task_id": task_id})
@@ -173,7 +356,7 @@ class GeneratorService:
 
             # Update final status
             if result.success:
-                await self.update_task_status(
+                await self.update_task_status_nowait(
                     task_id,
                     TaskStatus.COMPLETED,
                     progress=100.0,
@@ -187,9 +370,9 @@ class GeneratorService:
 
                     # Broadcast frame update event
                     if frame:
-                        await self._broadcast_frame_update(frame)
+                        self._broadcast_frame_update(frame)
             else:
-                await self.update_task_status(
+                await self.update_task_status_nowait(
                     task_id,
                     TaskStatus.FAILED,
                     error=result.error
@@ -197,7 +380,7 @@ class GeneratorService:
                 self.log.error("task_failed", extra={"task_id": task_id, "error": result.error})
 
         except Exception as e:
-            await self.update_task_status(
+            await self.update_task_status_nowait(
                 task_id,
                 TaskStatus.FAILED,
                 error=str(e)
@@ -206,6 +389,7 @@ class GeneratorService:
 
         finally:
             # Clean up
+            _progress_writer.discard(task_id)
             if task_id in self.running_tasks:
                 del self.running_tasks[task_id]
             self.log.info("task_cleanup", extra={"task_id": task_id})
@@ -257,25 +441,18 @@ class GeneratorService:
             # Don't fail the task if frame creation fails
             return None
 
-    async def _broadcast_frame_update(self, frame):
-        """Broadcast frame update event to all WebSocket clients"""
+    def _broadcast_frame_update(self, frame):
+        """Queue frame update event for all WebSocket clients (sent batched as frames_updated)"""
         try:
-            from handlers.websocket import broadcast_message
-
-            message = {
-                'type': 'frame_updated',
-                'data': {
-                    'frame_id': frame.id,
-                    'project_id': frame.project_id,
-                    'path': frame.path,
-                    'generator': frame.generator,
-                    'created_at': frame.created_at,
-                    'updated_at': frame.updated_at
-                }
-            }
-
-            await broadcast_message(message)
-            self.log.info("frame_update_broadcasted", extra={"frame_id": frame.id})
+            _frame_updates.add({
+                'frame_id': frame.id,
+                'project_id': frame.project_id,
+                'path': frame.path,
+                'generator': frame.generator,
+                'created_at': frame.created_at,
+                'updated_at': frame.updated_at
+            })
+            self.log.info("frame_update_queued", extra={"frame_id": frame.id})
 
         except Exception as e:
             self.log.exception("frame_update_broadcast_error", extra={"frame_id": getattr(frame, 'id', None)})
@@ -297,22 +474,18 @@ class GeneratorService:
             self.log.info("task_stopped", extra={"task_id": task_id})
 
         # Update status
-        await self.update_task_status(task_id, TaskStatus.STOPPED)
+        await self.update_task_status_nowait(task_id, TaskStatus.STOPPED)
 
         return True
 
-    def get_task_progress(self, task_id: int) -> Optional[float]:
-        """Get current progress of a running task"""
-        if task_id not in self.running_tasks:
-            return None
-
-        plugin = self.running_tasks[task_id]
-        return plugin.get_progress()
-
-    def get_available_plugins(self) -> Dict[str, Dict]:
-        """Get all available plugins"""
+    def get_available_plugins(self) -> Mapping[str, Dict]:
+        """Get all available plugins (read-only view cached by PluginRegistry)"""
         return PluginRegistry.get_all_plugins()
 
+    def get_available_plugins_json(self) -> bytes:
+        """Serialized list of visible plugins (cached by PluginRegistry)"""
+        return PluginRegistry.get_visible_plugins_json()
+
     async def stop_all_tasks(self) -> int:
         """
         Emergency stop all running tasks
@@ -329,7 +502,7 @@ class GeneratorService:
                 if success:
                     stopped_count += 1
             except Exception as e:
-                print(f"Error stopping task {task_id}: {e}")
+                self.log.warning("task_stop_failed", extra={"task_id": task_id, "error": str(e)})
                 continue
 
         return stopped_count
@@ -339,29 +512,17 @@ class GeneratorService:
         Clear all pending tasks from the queue
         Returns number of cleared tasks
         """
-        # Get all pending tasks
         query = """
-            SELECT id FROM tasks
+            UPDATE tasks
+            SET status = ?, updated_at = ?, completed_at = ?
             WHERE status = ?
         """
-        rows = await self.db.fetch_all(query, (TaskStatus.PENDING.value,))
-
-        pending_ids = [row['id'] for row in rows]
-        cleared_count = len(pending_ids)
-
-        if cleared_count > 0:
-            # Update all pending tasks to stopped
-            update_query = """
-                UPDATE tasks
-                SET status = ?, updated_at = ?, completed_at = ?
-                WHERE status = ?
-            """
-            now = datetime.utcnow().isoformat()
-            await self.db.execute(
-                update_query,
-                (TaskStatus.STOPPED.value, now, now, TaskStatus.PENDING.value)
-            )
-
+        now = utc_now_iso()
+        cleared_count = await self.db.execute_count(
+            query,
+            (TaskStatus.STOPPED.value, now, now, TaskStatus.PENDING.value)
+        )
+        _tasks_cache.invalidate()
         return cleared_count
 
     async def reset_all(self) -> Dict[str, int]:
@@ -378,15 +539,22 @@ class GeneratorService:
         }
 
     def _row_to_task_response(self, row) -> TaskResponse:
-        """Convert database row to TaskResponse"""
-        return TaskResponse(
+        """
+        Convert database row to TaskResponse
+
+        Tasks were validated on create, so validation is skipped with
+        model_construct; JSON columns and status are still decoded here.
+        progress is cast explicitly: SQLite returns a whole REAL such as 5.0
+        as int 5 from UPDATE ... RETURNING and model_construct does not coerce.
+        """
+        return TaskResponse.model_construct(
             id=row['id'],
             name=row['name'],
             type=row['type'],
-            data=json.loads(row['data']) if row['data'] else {},
+            data=orjson.loads(row['data']) if row['data'] else {},
             status=TaskStatus(row['status']),
-            progress=row['progress'],
-            result=json.loads(row['result']) if row['result'] else None,
+            progress=float(row['progress']),
+            result=orjson.loads(row['result']) if row['result'] else None,
             error=row['error'],
             created_at=row['created_at'],
             updated_at=row['updated_at'],
@@ -3,7 +3,7 @@ Model management service
 Provides access to available AI models in models_storage directory
 """
 import os
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 from config import Config
 
@@ -13,6 +13,10 @@ class ModelService:
 
     # Supported model file extensions
     MODEL_EXTENSIONS = ['.safetensors', '.ckpt', '.pth', '.pt', '.bin']
+    _MODEL_EXTENSION_SET = frozenset(MODEL_EXTENSIONS)
+
+    # Category listings keyed by category, valid while the directory mtime is unchanged
+    _category_cache: Dict[str, Tuple[int, List[Dict[str, str]]]] = {}
 
     @staticmethod
     def get_model_categories() -> List[str]:
@@ -45,28 +49,41 @@ class ModelService:
         Returns:
             List of model info dictionaries with 'filename' and 'display_name'
         """
-        models = []
         category_dir = Config.MODELS_STORAGE_DIR / category
 
-        if not category_dir.exists() or not category_dir.is_dir():
-            return models
-
-        for file_path in category_dir.iterdir():
-            if file_path.is_file() and file_path.suffix in ModelService.MODEL_EXTENSIONS:
-                # For now, display_name is same as filename
-                # TODO: Add logic to extract readable names from model metadata
-                models.append({
-                    'filename': file_path.name,
-                    'display_name': file_path.stem,  # Filename without extension
-                    'path': str(file_path),
-                    'size': file_path.stat().st_size,
-                    'extension': file_path.suffix
-                })
+        try:
+            dir_mtime = os.stat(category_dir).st_mtime_ns
+        except OSError:
+            return []
+
+        cached = ModelService._category_cache.get(category)
+        if cached is not None and cached[0] == dir_mtime:
+            return list(cached[1])
+
+        models = []
+        try:
+            with os.scandir(category_dir) as entries:
+                for entry in entries:
+                    name, extension = os.path.splitext(entry.name)
+                    if extension not in ModelService._MODEL_EXTENSION_SET or not entry.is_file():
+                        continue
+                    # For now, display_name is same as filename
+                    # TODO: Add logic to extract readable names from model metadata
+                    models.append({
+                        'filename': entry.name,
+                        'display_name': name,  # Filename without extension
+                        'path': entry.path,
+                        'size': entry.stat().st_size,
+                        'extension': extension
+                    })
+        except NotADirectoryError:
+            return []
 
         # Sort by filename
         models.sort(key=lambda x: x['filename'])
 
-        return models
+        ModelService._category_cache[category] = (dir_mtime, models)
+        return list(models)
 
     @staticmethod
     def model_exists(category: str, filename: str) -> bool:
@@ -2,9 +2,20 @@
 Project business logic service
 """
 from typing import Optional, List
-from datetime import datetime
-from database import Database
+from database import Database, QueryCache, build_update_templates, utc_now_iso
 from models.project import ProjectCreate, ProjectUpdate, ProjectResponse
+from logger import get_logger
+
+# get_all_projects result shared by all ProjectService instances (created per request)
+_projects_cache = QueryCache()
+
+# update_project statements keyed by bitmask of the fields set (name, width, height, fps)
+_PROJECT_UPDATE_QUERIES = build_update_templates(
+    "projects",
+    ("updated_at = ?",),
+    ("name = ?", "width = ?", "height = ?", "fps = ?"),
+    returning="id, name, width, height, fps, created_at, updated_at"
+)
 
 
 class ProjectService:
@@ -12,9 +23,28 @@ class ProjectService:
 
     def __init__(self, db: Database):
         self.db = db
+        self.log = get_logger("project")
+
+    @staticmethod
+    def _row_to_project(row) -> ProjectResponse:
+        """Convert database row to ProjectResponse (validated on write, so model_construct)"""
+        return ProjectResponse.model_construct(
+            id=row['id'],
+            name=row['name'],
+            width=row['width'],
+            height=row['height'],
+            fps=row['fps'],
+            created_at=row['created_at'],
+            updated_at=row['updated_at']
+        )
 
     async def get_all_projects(self) -> List[ProjectResponse]:
-        """Get all projects"""
+        """Get all projects (cached until the next project write)"""
+        cached = _projects_cache.get()
+        if cached is not None:
+            return list(cached)
+
+        version = _projects_cache.version
         query = """
             SELECT id, name, width, height, fps, created_at, updated_at
             FROM projects
@@ -22,19 +52,9 @@ class ProjectService:
         """
         rows = await self.db.fetch_all(query)
 
-        projects = []
-        for row in rows:
-            projects.append(ProjectResponse(
-                id=row['id'],
-                name=row['name'],
-                width=row['width'],
-                height=row['height'],
-                fps=row['fps'],
-                created_at=row['created_at'],
-                updated_at=row['updated_at']
-            ))
-
-        return projects
+        projects = [self._row_to_project(row) for row in rows]
+        _projects_cache.set(version, projects)
+        return list(projects)
 
     async def get_project_by_id(self, project_id: int) -> Optional[ProjectResponse]:
         """Get project by ID"""
@@ -48,112 +68,70 @@ class ProjectService:
         if not row:
             return None
 
-        return ProjectResponse(
-            id=row['id'],
-            name=row['name'],
-            width=row['width'],
-            height=row['height'],
-            fps=row['fps'],
-            created_at=row['created_at'],
-            updated_at=row['updated_at']
-        )
+        return self._row_to_project(row)
 
     async def create_project(self, project: ProjectCreate) -> ProjectResponse:
         """Create a new project"""
         query = """
             INSERT INTO projects (name, width, height, fps, created_at, updated_at)
             VALUES (?, ?, ?, ?, ?, ?)
+            RETURNING id, name, width, height, fps, created_at, updated_at
         """
-        now = datetime.utcnow().isoformat()
+        now = utc_now_iso()
 
-        project_id = await self.db.execute(
+        row = await self.db.execute_returning_one(
             query,
             (project.name, project.width, project.height, project.fps, now, now)
         )
-
-        # Fetch the created project
-        created_project = await self.get_project_by_id(project_id)
-        if not created_project:
+        _projects_cache.invalidate()
+        if not row:
             raise RuntimeError("Failed to create project")
 
-        return created_project
+        return self._row_to_project(row)
 
     async def update_project(
         self,
         project_id: int,
         project_update: ProjectUpdate
     ) -> Optional[ProjectResponse]:
-        """Update an existing project"""
-        # Check if project exists
-        existing = await self.get_project_by_id(project_id)
-        if not existing:
-            return None
-
-        # Build dynamic update query
-        update_fields = []
-        params = []
-
-        if project_update.name is not None:
-            update_fields.append("name = ?")
-            params.append(project_update.name)
-
-        if project_update.width is not None:
-            update_fields.append("width = ?")
-            params.append(project_update.width)
+        """Update an existing project (None if not found)"""
+        values = (project_update.name, project_update.width, project_update.height, project_update.fps)
 
-        if project_update.height is not None:
-            update_fields.append("height = ?")
-            params.append(project_update.height)
+        mask = 0
+        params = [utc_now_iso()]
+        for bit, value in enumerate(values):
+            if value is not None:
+                mask |= 1 << bit
+                params.append(value)
 
-        if project_update.fps is not None:
-            update_fields.append("fps = ?")
-            params.append(project_update.fps)
-
-        if not update_fields:
+        if not mask:
             # Nothing to update
-            return existing
-
-        # Add updated_at
-        update_fields.append("updated_at = ?")
-        params.append(datetime.utcnow().isoformat())
+            return await self.get_project_by_id(project_id)
 
-        # Add project_id for WHERE clause
         params.append(project_id)
 
-        query = f"""
-            UPDATE projects
-            SET {', '.join(update_fields)}
-            WHERE id = ?
-        """
-
-        await self.db.execute(query, tuple(params))
+        row = await self.db.execute_returning_one(_PROJECT_UPDATE_QUERIES[mask], tuple(params))
+        _projects_cache.invalidate()
 
-        # Fetch updated project
-        return await self.get_project_by_id(project_id)
+        return self._row_to_project(row) if row else None
 
     async def delete_project(self, project_id: int) -> bool:
         """Delete a project and all associated frames"""
-        # Check if project exists
-        existing = await self.get_project_by_id(project_id)
-        if not existing:
-            return False
+        from services.frame_service import unlink_frame_files
 
-        # Import frame service to delete associated frames
-        from services.frame_service import FrameService
-        frame_service = FrameService(self.db)
+        # Frame rows and the project go in one transaction; frame paths come back via RETURNING
+        async with self.db.transaction() as cursor:
+            await cursor.execute("DELETE FROM frames WHERE project_id = ? RETURNING path", (project_id,))
+            frame_rows = await cursor.fetchall()
+            await cursor.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+            deleted = cursor.rowcount > 0
 
-        # Get all frames for this project
-        frames = await frame_service.get_frames_by_project(project_id)
-
-        # Delete all associated frames (this will also delete their files)
-        for frame in frames:
-            await frame_service.delete_frame(frame.id)
-            print(f"Deleted frame {frame.id} for project {project_id}")
+        if not deleted:
+            return False
+        _projects_cache.invalidate()
 
-        # Delete the project from database
-        query = "DELETE FROM projects WHERE id = ?"
-        await self.db.execute(query, (project_id,))
+        await unlink_frame_files([row['path'] for row in frame_rows])
 
-        print(f"Deleted project {project_id} and {len(frames)} associated frames")
+        self.log.info("project_deleted", extra={"project_id": project_id, "frames": len(frame_rows)})
         return True
 
@@ -1,9 +1,26 @@
 """
 System monitoring service for CPU, GPU, and memory metrics
 """
+import asyncio
+import time
 import psutil
 from typing import Dict, Any, Optional, Tuple
 
+# GPU monitoring backends are optional: CPU-only installs run without them
+try:
+    import torch
+except ImportError:
+    torch = None
+
+try:
+    import pynvml  # nvidia-ml-py3
+except ImportError:
+    pynvml = None
+
+# Seconds a metrics / disk usage reading is reused by the async getters
+METRICS_CACHE_TTL = 0.5
+DISK_USAGE_CACHE_TTL = 5.0
+
 
 class SystemMonitor:
     """Monitor system resources (CPU, GPU, Memory)"""
@@ -13,6 +30,48 @@ class SystemMonitor:
         self._gpu_available = self._gpu_info[0]
         self._gpu_type = self._gpu_info[1]
 
+        # NVML is initialized once and kept for the monitor's lifetime (see close())
+        self._nvml = None
+        self._nvml_handle = None
+        if self._gpu_type == 'cuda':
+            self._init_nvml()
+
+        # GPU metrics reader picked once: Intel XPU (Arc GPU), NVIDIA CUDA or none
+        self._gpu_metrics_fn = {
+            'xpu': self._get_xpu_metrics,
+            'cuda': self._get_cuda_metrics,
+        }.get(self._gpu_type)
+        self._torch = torch
+
+        # Prime CPU sampling: get_metrics reads the usage since the previous call without sleeping
+        psutil.cpu_percent(interval=None)
+
+        # (monotonic time, value) of the last readings
+        self._metrics_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._disk_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+    def _init_nvml(self):
+        """Initialize NVML and keep the device handle (nvidia-ml-py3 is optional)"""
+        if pynvml is None:
+            return
+        try:
+            pynvml.nvmlInit()
+            self._nvml_handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+            self._nvml = pynvml
+        except Exception:
+            self._nvml = None
+            self._nvml_handle = None
+
+    def close(self):
+        """Release NVML (call on application shutdown)"""
+        if self._nvml is not None:
+            try:
+                self._nvml.nvmlShutdown()
+            except Exception:
+                pass
+            self._nvml = None
+            self._nvml_handle = None
+
     def _check_gpu_available(self) -> Tuple[bool, str]:
         """
         Check if GPU monitoring is available and determine GPU type
@@ -21,9 +80,10 @@ class SystemMonitor:
             Tuple[bool, str]: (is_available, gpu_type)
             gpu_type can be: 'xpu' (Intel Arc), 'cuda' (NVIDIA), or 'none'
         """
-        try:
-            import torch
+        if torch is None:
+            return (False, 'none')
 
+        try:
             # Check for Intel XPU (Arc GPU)
             if hasattr(torch, 'xpu') and torch.xpu.is_available():
                 return (True, 'xpu')
@@ -45,7 +105,7 @@ class SystemMonitor:
             Dict with cpu_percent, memory_percent, gpu_percent, gpu_memory_percent, gpu_type
         """
         metrics = {
-            'cpu_percent': round(psutil.cpu_percent(interval=0.1), 1),
+            'cpu_percent': round(psutil.cpu_percent(interval=None), 1),
             'memory_percent': round(psutil.virtual_memory().percent, 1),
             'gpu_percent': 0.0,
             'gpu_memory_percent': 0.0,
@@ -53,23 +113,24 @@ class SystemMonitor:
             'gpu_type': self._gpu_type
         }
 
-        if self._gpu_available:
+        if self._gpu_metrics_fn is not None:
             try:
-                import torch
-
-                if self._gpu_type == 'xpu':
-                    # Intel XPU (Arc GPU) monitoring
-                    metrics.update(self._get_xpu_metrics(torch))
-
-                elif self._gpu_type == 'cuda':
-                    # NVIDIA CUDA monitoring
-                    metrics.update(self._get_cuda_metrics(torch))
-
+                metrics.update(self._gpu_metrics_fn(self._torch))
             except Exception as e:
                 print(f"GPU monitoring error: {e}")
 
         return metrics
 
+    async def get_metrics_cached(self) -> Dict[str, Any]:
+        """get_metrics() read in a worker thread, reused for METRICS_CACHE_TTL seconds"""
+        now = time.monotonic()
+        if self._metrics_cache is not None and now - self._metrics_cache[0] < METRICS_CACHE_TTL:
+            return self._metrics_cache[1]
+
+        metrics = await asyncio.to_thread(self.get_metrics)
+        self._metrics_cache = (time.monotonic(), metrics)
+        return metrics
+
     def _get_xpu_metrics(self, torch) -> Dict[str, float]:
         """
         Get Intel XPU (Arc GPU) metrics
@@ -129,9 +190,10 @@ class SystemMonitor:
         try:
             # GPU utilization (requires nvidia-ml-py3 for accurate readings)
             try:
-                import pynvml
-                pynvml.nvmlInit()
-                handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+                if self._nvml_handle is None:
+                    raise RuntimeError("NVML not available")
+                pynvml = self._nvml
+                handle = self._nvml_handle
 
                 # GPU utilization
                 util = pynvml.nvmlDeviceGetUtilizationRates(handle)
@@ -142,8 +204,6 @@ class SystemMonitor:
                 metrics['gpu_memory_percent'] = round(
                     (mem_info.used / mem_info.total) * 100, 1
                 )
-
-                pynvml.nvmlShutdown()
             except:
                 # Fallback to PyTorch memory info
                 mem_allocated = torch.cuda.memory_allocated(0)
@@ -157,16 +217,23 @@ class SystemMonitor:
 
         return metrics
 
-    def get_disk_usage(self, path: str = '/') -> Dict[str, Any]:
-        """Get disk usage for a path"""
+    async def get_disk_usage(self, path: str = '/') -> Dict[str, Any]:
+        """Get disk usage for a path (stat runs in a worker thread, cached for DISK_USAGE_CACHE_TTL seconds)"""
+        cached = self._disk_cache.get(path)
+        if cached is not None and time.monotonic() - cached[0] < DISK_USAGE_CACHE_TTL:
+            return cached[1]
+
         try:
-            usage = psutil.disk_usage(path)
-            return {
+            usage = await asyncio.to_thread(psutil.disk_usage, path)
+            result = {
                 'total': usage.total,
                 'used': usage.used,
                 'free': usage.free,
                 'percent': round(usage.percent, 1)
             }
         except:
-            return {'percent': 0.0}
+            result = {'percent': 0.0}
+
+        self._disk_cache[path] = (time.monotonic(), result)
+        return result
 
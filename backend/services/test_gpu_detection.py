@@ -10,85 +10,170 @@ Run this script to check what GPU is available on your system:
 Usage:
     python test_gpu_detection.py
 """
+import importlib.util
+import sys
 
-from system_monitor import SystemMonitor
+import psutil
 
+from system_monitor import SystemMonitor
 
-def main():
-    print("=" * 60)
-    print("GPU Detection Test")
-    print("=" * 60)
+SEP_EQ = "=" * 60
+SEP_DASH = "-" * 60
 
-    # Create system monitor
-    monitor = SystemMonitor()
+# CPU usage sampling window (seconds) for the one-shot report
+CPU_SAMPLE_INTERVAL = 0.1
 
-    # Get GPU info
-    print(f"\nGPU Available: {monitor._gpu_available}")
-    print(f"GPU Type: {monitor._gpu_type}")
 
-    # Get full metrics
-    print("\nSystem Metrics:")
-    print("-" * 60)
-    metrics = monitor.get_metrics()
-    for key, value in metrics.items():
-        print(f"  {key}: {value}")
+def nvml_devices():
+    """
+    (index, name, memory info, utilization) of all NVIDIA devices read through NVML
 
-    print("\n" + "=" * 60)
+    One nvmlInit for the whole enumeration; None if pynvml is missing or NVML fails.
+    """
+    try:
+        import pynvml
+        pynvml.nvmlInit()
+    except Exception:
+        return None
 
-    # Additional PyTorch info
-    print("\nPyTorch GPU Information:")
-    print("-" * 60)
+    try:
+        devices = []
+        for i in range(pynvml.nvmlDeviceGetCount()):
+            handle = pynvml.nvmlDeviceGetHandleByIndex(i)
+            name = pynvml.nvmlDeviceGetName(handle)
+            if isinstance(name, bytes):  # nvidia-ml-py3 returns bytes
+                name = name.decode()
+            devices.append((
+                i,
+                name,
+                pynvml.nvmlDeviceGetMemoryInfo(handle),
+                pynvml.nvmlDeviceGetUtilizationRates(handle)
+            ))
+        return devices
+    except Exception:
+        return None
+    finally:
+        pynvml.nvmlShutdown()
+
+
+def report_torch_info(out: list, list_devices: bool):
+    """
+    Append PyTorch version, CUDA/XPU availability and (with list_devices) per-device details
+
+    Device enumeration is skipped when SystemMonitor found no GPU; the version and
+    availability lines are always reported since they explain why.
+    """
     try:
         import torch
-        print(f"PyTorch version: {torch.__version__}")
+        out.append(f"PyTorch version: {torch.__version__}")
+
+        # Query each driver value once (first calls may initialize CUDA/XPU)
+        cuda_ok = torch.cuda.is_available()
+        has_xpu = hasattr(torch, 'xpu')
+        xpu_ok = has_xpu and torch.xpu.is_available()
+        cuda_n = torch.cuda.device_count() if cuda_ok and list_devices else 0
+        xpu_n = torch.xpu.device_count() if xpu_ok and list_devices else 0
+
+        # All devices enumerated in one pass: NVML for NVIDIA when available,
+        # otherwise (index, name, properties) from torch
+        nvml_devs = nvml_devices() if cuda_n else None
+        cuda_devs = [
+            (i, torch.cuda.get_device_name(i), torch.cuda.get_device_properties(i))
+            for i in range(cuda_n)
+        ] if nvml_devs is None else []
+        xpu_devs = [
+            (i, torch.xpu.get_device_name(i), torch.xpu.get_device_properties(i))
+            for i in range(xpu_n)
+        ]
 
         # Check CUDA
-        print(f"\nCUDA available: {torch.cuda.is_available()}")
-        if torch.cuda.is_available():
-            print(f"CUDA version: {torch.version.cuda}")
-            print(f"CUDA device count: {torch.cuda.device_count()}")
-            if torch.cuda.device_count() > 0:
-                print(f"CUDA device 0: {torch.cuda.get_device_name(0)}")
+        out.append(f"\nCUDA available: {cuda_ok}")
+        if cuda_ok:
+            out.append(f"CUDA version: {torch.version.cuda}")
+        if cuda_n:
+            out.append(f"CUDA device count: {cuda_n}")
+            for i, name, mem, util in nvml_devs or []:
+                out.append(f"CUDA device {i}: {name} ({mem.total / 1024**3:.1f} GB, "
+                           f"{mem.used / 1024**3:.1f} GB used, {util.gpu}% busy)")
+            for i, name, props in cuda_devs:
+                out.append(f"CUDA device {i}: {name} ({props.total_memory / 1024**3:.1f} GB)")
 
         # Check XPU (Intel Arc)
-        if hasattr(torch, 'xpu'):
-            print(f"\nXPU available: {torch.xpu.is_available()}")
-            if torch.xpu.is_available():
-                print(f"XPU device count: {torch.xpu.device_count()}")
-                if torch.xpu.device_count() > 0:
-                    print(f"XPU device 0: {torch.xpu.get_device_name(0)}")
+        if has_xpu:
+            out.append(f"\nXPU available: {xpu_ok}")
+            if xpu_n:
+                out.append(f"XPU device count: {xpu_n}")
+                for i, name, props in xpu_devs:
+                    out.append(f"XPU device {i}: {name} ({props.total_memory / 1024**3:.1f} GB)")
         else:
-            print("\nXPU: Not supported (PyTorch not compiled with XPU support)")
+            out.append("\nXPU: Not supported (PyTorch not compiled with XPU support)")
 
     except Exception as e:
-        print(f"Error checking PyTorch: {e}")
+        out.append(f"Error checking PyTorch: {e}")
+
+
+def main():
+    has_pynvml = importlib.util.find_spec('pynvml') is not None
+
+    # Report lines, written to stdout at once
+    out = []
 
-    print("\n" + "=" * 60)
-    print("\nRecommendations:")
-    print("-" * 60)
+    out.append(SEP_EQ)
+    out.append("GPU Detection Test")
+    out.append(SEP_EQ)
+
+    # Create system monitor
+    monitor = SystemMonitor()
+
+    # Get GPU info
+    out.append(f"\nGPU Available: {monitor._gpu_available}")
+    out.append(f"GPU Type: {monitor._gpu_type}")
+
+    # Get full metrics
+    out.append("\nSystem Metrics:")
+    out.append(SEP_DASH)
+    metrics = monitor.get_metrics()
+    # SystemMonitor reads CPU usage since its previous call, which was just now in __init__
+    metrics['cpu_percent'] = round(psutil.cpu_percent(interval=CPU_SAMPLE_INTERVAL), 1)
+    out.extend(f"  {key}: {value}" for key, value in metrics.items())
+
+    out.append("\n" + SEP_EQ)
+
+    # Additional PyTorch info
+    out.append("\nPyTorch GPU Information:")
+    out.append(SEP_DASH)
+    report_torch_info(out, list_devices=monitor._gpu_available)
+
+    out.append("\n" + SEP_EQ)
+    out.append("\nRecommendations:")
+    out.append(SEP_DASH)
 
     if monitor._gpu_type == 'xpu':
-        print("✅ Intel Arc GPU (XPU) detected!")
-        print("   - Metrics will show XPU usage and VRAM in the UI")
-        print("   - GPU utilization is estimated from memory usage")
+        out.append("✅ Intel Arc GPU (XPU) detected!")
+        out.append("   - Metrics will show XPU usage and VRAM in the UI")
+        out.append("   - GPU utilization is estimated from memory usage")
     elif monitor._gpu_type == 'cuda':
-        print("✅ NVIDIA GPU (CUDA) detected!")
-        print("   - Metrics will show GPU usage and VRAM in the UI")
-        if 'pynvml' in dir():
-            print("   - Using nvidia-ml-py3 for accurate GPU metrics")
+        out.append("✅ NVIDIA GPU (CUDA) detected!")
+        out.append("   - Metrics will show GPU usage and VRAM in the UI")
+        if has_pynvml:
+            out.append("   - Using nvidia-ml-py3 for accurate GPU metrics")
         else:
-            print("   - Install nvidia-ml-py3 for more accurate metrics:")
-            print("     pip install nvidia-ml-py3")
+            out.append("   - Install nvidia-ml-py3 for more accurate metrics:")
+            out.append("     pip install nvidia-ml-py3")
     else:
-        print("ℹ️  No GPU detected")
-        print("   - Application will run on CPU only")
-        print("   - To enable GPU support:")
-        print("\n   For Intel Arc GPU:")
-        print("     pip install torch --index-url https://download.pytorch.org/whl/xpu")
-        print("\n   For NVIDIA GPU:")
-        print("     pip install torch --index-url https://download.pytorch.org/whl/cu118")
-
-    print("=" * 60)
+        out.append("ℹ️  No GPU detected")
+        out.append("   - Application will run on CPU only")
+        out.append("   - To enable GPU support:")
+        out.append("\n   For Intel Arc GPU:")
+        out.append("     pip install torch --index-url https://download.pytorch.org/whl/xpu")
+        out.append("\n   For NVIDIA GPU:")
+        out.append("     pip install torch --index-url https://download.pytorch.org/whl/cu118")
+
+    out.append(SEP_EQ)
+
+    monitor.close()
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
@@ -35,10 +35,17 @@ export interface Frame {
   generator: string;
   project_id: number;
   variant_id: number;
+  parent_frame_id: number | null; // First frame of the variant group (own id for base frames)
   created_at: string;
   updated_at: string;
 }
 
+export interface FrameListResponse {
+  total: number;
+  frames: Frame[];
+  next_cursor?: string | null; // Set when limit was used and more frames follow
+}
+
 export interface BackendHealth {
   status: string;
   service: string;
@@ -85,6 +92,12 @@ export interface Task {
   completed_at?: string;
 }
 
+export interface TaskListResponse {
+  total: number;
+  tasks: Task[];
+  next_before_id?: number | null; // Set when limit was used and more tasks follow
+}
+
 export interface TaskCreate {
   name: string;
   type: string;
@@ -194,7 +207,7 @@ export const framesAPI = {
    * Get all frames for a project
    */
   getByProject: async (projectId: number): Promise<Frame[]> => {
-    const response = await fetchAPI<{ total: number; frames: Frame[] }>(
+    const response = await fetchAPI<FrameListResponse>(
       `/api/v1/projects/${projectId}/frames`
     );
     return response.frames;
@@ -205,7 +218,7 @@ export const framesAPI = {
    */
   getAll: async (projectId?: number): Promise<Frame[]> => {
     const query = projectId ? `?project_id=${projectId}` : "";
-    const response = await fetchAPI<{ total: number; frames: Frame[] }>(
+    const response = await fetchAPI<FrameListResponse>(
       `/api/v1/frames${query}`
     );
     return response.frames;
@@ -308,7 +321,7 @@ export const generatorAPI = {
    * Get all tasks
    */
   getAllTasks: async (): Promise<Task[]> => {
-    const response = await fetchAPI<{ total: number; tasks: Task[] }>(
+    const response = await fetchAPI<TaskListResponse>(
       "/api/v1/generator/tasks"
     );
     return response.tasks;
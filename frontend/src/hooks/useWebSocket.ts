@@ -23,9 +23,21 @@ export interface SystemMetrics {
 
 type MetricsMessage = { type: "metrics"; data: SystemMetrics };
 type FrameUpdatedMessage = { type: "frame_updated"; data: FrameUpdateEvent };
-type OtherMessageType = Exclude<string, "metrics" | "frame_updated">;
+// Frame updates coalesced by the backend within a short window
+type FramesUpdatedMessage = { type: "frames_updated"; data: FrameUpdateEvent[] };
+// Several messages sent together by the backend (PendingBroadcast)
+type BatchMessage = { type: "batch"; packets: WebSocketMessage[] };
+type OtherMessageType = Exclude<
+  string,
+  "metrics" | "frame_updated" | "frames_updated" | "batch"
+>;
 type OtherMessage = { type: OtherMessageType; data?: unknown };
-type WebSocketMessage = MetricsMessage | FrameUpdatedMessage | OtherMessage;
+type WebSocketMessage =
+  | MetricsMessage
+  | FrameUpdatedMessage
+  | FramesUpdatedMessage
+  | BatchMessage
+  | OtherMessage;
 
 export interface FrameUpdateEvent {
   frame_id: number;
@@ -68,27 +80,41 @@ export const useWebSocket = (onFrameUpdate?: FrameUpdateCallback) => {
         setIsConnected(true);
       };
 
-      ws.onmessage = (event) => {
-        try {
-          const message: WebSocketMessage = JSON.parse(event.data);
-
-          if (message.type === "metrics") {
-            setMetrics((message as MetricsMessage).data);
-            log.debug("ws_metrics", (message as MetricsMessage).data);
-          } else if (message.type === "frame_updated") {
-            log.info("frame_updated", (message as FrameUpdatedMessage).data);
-            if (frameUpdateCallbackRef.current) {
-              frameUpdateCallbackRef.current(
-                (message as FrameUpdatedMessage).data
-              );
-            }
-          } else {
-            // Pass all other messages (generation_started, generation_completed, etc.) to callback
-            log.info("ws_message", { type: message.type, data: message.data });
+      const handleMessage = (message: WebSocketMessage) => {
+        if (message.type === "batch") {
+          (message as BatchMessage).packets.forEach(handleMessage);
+        } else if (message.type === "metrics") {
+          setMetrics((message as MetricsMessage).data);
+          log.debug("ws_metrics", (message as MetricsMessage).data);
+        } else if (message.type === "frame_updated") {
+          log.info("frame_updated", (message as FrameUpdatedMessage).data);
+          if (frameUpdateCallbackRef.current) {
+            frameUpdateCallbackRef.current(
+              (message as FrameUpdatedMessage).data
+            );
+          }
+        } else if (message.type === "frames_updated") {
+          (message as FramesUpdatedMessage).data.forEach((event) => {
+            log.info("frame_updated", event);
             if (frameUpdateCallbackRef.current) {
-              frameUpdateCallbackRef.current(message);
+              frameUpdateCallbackRef.current(event);
             }
+          });
+        } else {
+          // Pass all other messages (generation_started, generation_completed, etc.) to callback
+          log.info("ws_message", {
+            type: message.type,
+            data: (message as OtherMessage).data,
+          });
+          if (frameUpdateCallbackRef.current) {
+            frameUpdateCallbackRef.current(message);
           }
+        }
+      };
+
+      ws.onmessage = (event) => {
+        try {
+          handleMessage(JSON.parse(event.data));
         } catch (err) {
           log.error("ws_parse_error", err);
         }